@@ -1,4 +1,7 @@
-class AppConstants:
+from personalize_commons.constants.interned import InternedConstants
+
+
+class AppConstants(metaclass=InternedConstants):
     STRING = 'string'
     VALUE = 'value'
     OPERATOR = 'operator'
@@ -53,4 +56,4 @@ class AppConstants:
     DOMAINS_SPECIFIC='domain_specific'
     DESCRIPTION='description'
     TYPE='type'
-    NAME='name'
\ No newline at end of file
+    NAME='name'
@@ -1,4 +1,7 @@
-class AppMessage:
+from personalize_commons.constants.interned import InternedConstants
+
+
+class AppMessage(metaclass=InternedConstants):
     RECOM_NOT_FOUND = 'recommendation not found'
     CAMPAIGN_NOT_FOUND = 'campaign_not_found'
     SUCCESS = "success"
@@ -1,7 +1,18 @@
 # context.py
 import contextvars
+from concurrent.futures import Executor, Future
+from typing import Any, Callable
 
 from personalize_commons.constants.app_constants import AppConstants
 
 
 tenant_id_ctx = contextvars.ContextVar(AppConstants.X_MDM_PERSONALIZE, default=None)
+
+
+def run_in_executor_with_ctx(executor: Executor, fn: Callable[..., Any], *args, **kwargs) -> Future:
+    """
+    Submit fn to the executor inside a copy of the caller's context.
+    Use this instead of executor.submit so tenant_id_ctx is visible in pool threads.
+    """
+    ctx = contextvars.copy_context()
+    return executor.submit(ctx.run, fn, *args, **kwargs)
@@ -1,14 +1,21 @@
-class DBConstants:
+from personalize_commons.constants.interned import InternedConstants
+
+
+class DBConstants(metaclass=InternedConstants):
 
     # indexes
     UPDATED_AT_INDEX = 'UpdatedAtIndex'
     CREATED_AT_INDEX = 'CreatedAtIndex'
     STAUS_AT_INDEX = 'StatusIndex'
     EMAIL_INDEX = 'email_index'
+    # GSI: PK tenant_status, SK created_at
+    STATUS_CREATED_AT_INDEX = 'StatusCreatedAtIndex'
 
     # fields
     CREATED_AT = 'created_at'
     UPDATED_AT = 'updated_at'
     COMPLETED_AT = 'completed_at'
     STATUS = 'status'
+    # synthetic "<tenant_id>#<status>" partition key of STATUS_CREATED_AT_INDEX
+    TENANT_STATUS = 'tenant_status'
     MONTH = 'month'
\ No newline at end of file
@@ -1,4 +1,6 @@
 from enum import Enum
+from typing import Optional
+
 
 class EventType(str, Enum):
     RECOMMENDATION_TRIGGERED = "recommendation.triggered"
@@ -9,4 +11,10 @@ class EventType(str, Enum):
     NOTIFICATION_COMPLETED = "notification.completed"
     NOTIFICATION_FAILED = "notification.failed"
 
+    @staticmethod
+    def from_value(value: str) -> Optional['EventType']:
+        """Look up an EventType by its value (e.g. a message's event_type); None if unknown."""
+        return _EVENT_TYPE_BY_VALUE.get(value)
+
 
+_EVENT_TYPE_BY_VALUE = {event_type.value: event_type for event_type in EventType}
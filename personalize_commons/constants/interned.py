@@ -0,0 +1,15 @@
+import sys
+
+
+class InternedConstants(type):
+    """
+    Metaclass for constant holder classes.
+    Interns every str class attribute so dict-key lookups using these
+    constants hit CPython's identity fast path.
+    """
+
+    def __new__(mcs, name, bases, namespace):
+        for key, value in namespace.items():
+            if isinstance(value, str) and not key.startswith('__'):
+                namespace[key] = sys.intern(value)
+        return super().__new__(mcs, name, bases, namespace)
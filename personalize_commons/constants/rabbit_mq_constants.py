@@ -1,4 +1,7 @@
-class RabbitMQConstants:
+from personalize_commons.constants.interned import InternedConstants
+
+
+class RabbitMQConstants(metaclass=InternedConstants):
     RECOMMENDATION_EXCHANGE  = 'personalize'
     DLQ_EXCHANGE = "recommendations.dlx"
     RECOMMENDATION_QUEUE = 'recommendations'
@@ -6,7 +9,33 @@ class RabbitMQConstants:
     RECOMMENDATION_START_ROUTING_KEY = 'recommendation.start'
     RECOMMENDATION_DLQ_ROUTING_KEY = "recommendation.dlq"
 
-    class Payload:
+    # retry: failed messages wait RETRY_TTL_MS in the retry queue, then dead-letter back
+    # to the main exchange; after MAX_RETRIES attempts they go to the DLQ instead
+    RETRY_EXCHANGE = "recommendations.retry"
+    RETRY_QUEUE = "recommendations.retry"
+    RECOMMENDATION_RETRY_ROUTING_KEY = "recommendation.retry"
+    MAX_RETRIES = 5
+    RETRY_TTL_MS = 30_000
+    RETRY_QUEUE_ARGUMENTS = {
+        'x-message-ttl': RETRY_TTL_MS,
+        'x-dead-letter-exchange': RECOMMENDATION_EXCHANGE,
+        'x-dead-letter-routing-key': RECOMMENDATION_START_ROUTING_KEY,
+    }
+
+    # classic queues, bounded so a backlog rejects publishes instead of paging to disk;
+    # pass as queue_declare(arguments=...) and basic_qos(prefetch_count=CONSUMER_PREFETCH)
+    QUEUE_ARGUMENTS = {
+        'x-queue-type': 'classic',
+        'x-max-length': 100_000,
+        'x-overflow': 'reject-publish',
+    }
+    CONSUMER_PREFETCH = 50
+
+    # batching: flush after BATCH_MAX_SIZE envelopes or BATCH_MAX_DELAY_MS, whichever first
+    BATCH_MAX_SIZE = 100
+    BATCH_MAX_DELAY_MS = 200
+
+    class Payload(metaclass=InternedConstants):
         CAMPAIGN_ID='campaign_id'
         RECOMMENDATION_ID='recommendation_id'
         TENANT_ID='tenant_id'
@@ -15,4 +44,7 @@ class RabbitMQConstants:
         SOURCE='source'
         TIMESTAMP='timestamp'
         RETRY_COUNT='retry_count'
+        BATCH='batch'
+        BATCH_SIZE='batch_size'
+
 
@@ -1,37 +1,176 @@
 import os
+import threading
+from functools import cache
 
 import boto3
+import botocore.session
+from botocore.config import Config
+from botocore.parsers import JSONParser, ResponseParserFactory
 from dotenv import load_dotenv
 
-load_dotenv()
-# Singleton instance
-dynamodb_resource = boto3.resource(
-    'dynamodb',
-    region_name=os.getenv("AWS_REGION", "ap-south-1"),
-    aws_access_key_id=os.getenv("AWS_DYNAMODB_ACCESS_KEY_ID"),
-    aws_secret_access_key=os.getenv("AWS_DYNAMODB_SECRET_ACCESS_KEY"),
+# Shared client config: larger connection pool for concurrent repository use,
+# TCP keepalive to reuse connections, adaptive retries for throttling.
+# The pool must cover the widest fan-out over one client: AsyncCampaignRepository's 50 in-flight calls
+# (get_all_tenants segments and the batch writers use 8 workers each).
+boto_config = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "max_attempts": 5},
 )
 
-dynamodb_client = boto3.client(
-    'dynamodb',
-    region_name=os.getenv("AWS_REGION", "ap-south-1"),
-    aws_access_key_id=os.getenv("AWS_DYNAMODB_ACCESS_KEY_ID"),
-    aws_secret_access_key=os.getenv("AWS_DYNAMODB_SECRET_ACCESS_KEY"),
-)
+# DynamoDB calls are small and fast: fail over to a retry quickly instead of waiting out the 60 s defaults.
+# Not applied to S3, where large object transfers legitimately take longer.
+dynamodb_config = boto_config.merge(Config(connect_timeout=1.0, read_timeout=2.0))
+
+# Counter writes (UpdateItem ADD) are not idempotent: a request that times out after DynamoDB applied it is
+# re-sent by the retry handler and counted twice. They keep the 60 s default read timeout: a slow response is
+# waited out, so retries are in practice limited to requests DynamoDB never applied (connect errors, throttling),
+# at the cost of a stalled call blocking its caller for up to a minute.
+dynamodb_counter_config = boto_config.merge(Config(connect_timeout=1.0))
+
+
+@cache
+def _ensure_env() -> None:
+    """Load .env once, on first client construction instead of at import time."""
+    load_dotenv()
+
+
+@cache
+def get_env(name: str, default: str | None = None) -> str | None:
+    """os.getenv after .env is loaded; each setting is read once per process."""
+    _ensure_env()
+    return os.getenv(name, default)
 
-s3_client = boto3.client(
-    's3',
-    aws_access_key_id=os.getenv('AWS_S3_ACCESS_KEY_ID'),
-    aws_secret_access_key=os.getenv('AWS_S3_SECRET_ACCESS_KEY'),
-    region_name=os.getenv('AWS_S3_REGION', 'ap-south-1')
-)
 
+# Clients are built on first use and cached (singleton instances)
+
+@cache
 def get_dynamodb_resource():
-    return dynamodb_resource
+    _ensure_env()
+    return boto3.resource(
+        'dynamodb',
+        region_name=os.getenv("AWS_REGION", "ap-south-1"),
+        aws_access_key_id=os.getenv("AWS_DYNAMODB_ACCESS_KEY_ID"),
+        aws_secret_access_key=os.getenv("AWS_DYNAMODB_SECRET_ACCESS_KEY"),
+        config=dynamodb_config,
+    )
 
 
+@cache
 def get_dynamodb_client():
-    return dynamodb_client
+    _ensure_env()
+    return boto3.client(
+        'dynamodb',
+        region_name=os.getenv("AWS_REGION", "ap-south-1"),
+        aws_access_key_id=os.getenv("AWS_DYNAMODB_ACCESS_KEY_ID"),
+        aws_secret_access_key=os.getenv("AWS_DYNAMODB_SECRET_ACCESS_KEY"),
+        config=dynamodb_config,
+    )
+
+@cache
+def get_dynamodb_counter_client():
+    """Low-level client for non-idempotent counter updates, see dynamodb_counter_config."""
+    _ensure_env()
+    return boto3.client(
+        'dynamodb',
+        region_name=os.getenv("AWS_REGION", "ap-south-1"),
+        aws_access_key_id=os.getenv("AWS_DYNAMODB_ACCESS_KEY_ID"),
+        aws_secret_access_key=os.getenv("AWS_DYNAMODB_SECRET_ACCESS_KEY"),
+        config=dynamodb_counter_config,
+    )
+
+
+class _RawJSONParser(JSONParser):
+    """JSON protocol parser that returns the decoded body without walking the output shape."""
+
+    def _handle_json_body(self, raw_body, shape):
+        return self._parse_body_as_json(raw_body)
+
+
+class _RawResponseParserFactory(ResponseParserFactory):
+    def create_parser(self, protocol_name):
+        if protocol_name == 'json':
+            return _RawJSONParser(**self._defaults)
+        return super().create_parser(protocol_name)
+
+
+@cache
+def get_dynamodb_raw_client():
+    """
+    Low-level DynamoDB client whose responses skip botocore's shape parsing (~10x cheaper on large pages).
+    AttributeValues are identical; blobs stay base64 strings and timestamps stay epoch numbers,
+    so it is only for callers that decode items themselves (UserRepository).
+    """
+    _ensure_env()
+    core_session = botocore.session.get_session()
+    core_session.register_component('response_parser_factory', _RawResponseParserFactory())
+    return boto3.Session(
+        botocore_session=core_session,
+        region_name=os.getenv("AWS_REGION", "ap-south-1"),
+        aws_access_key_id=os.getenv("AWS_DYNAMODB_ACCESS_KEY_ID"),
+        aws_secret_access_key=os.getenv("AWS_DYNAMODB_SECRET_ACCESS_KEY"),
+    ).client('dynamodb', config=dynamodb_config)
+
+# (id(resource), table_name) -> (resource, Table); the resource is kept so its id cannot be reused
+_tables: dict = {}
+_tables_lock = threading.Lock()
+
+
+def get_table(resource, table_name: str):
+    """
+    Return a shared Table handle for (resource, table_name).
+    Keyed by resource identity: boto3 service resources compare equal to each other,
+    so a DynamoDB and a DAX resource must not share a cache entry.
+    """
+    key = (id(resource), table_name)
+    entry = _tables.get(key)
+    if entry is None:
+        with _tables_lock:
+            entry = _tables.get(key)
+            if entry is None:
+                entry = _tables[key] = (resource, resource.Table(table_name))
+    return entry[1]
+
+
+def _dynamodb_session() -> boto3.Session:
+    return boto3.Session(
+        region_name=os.getenv("AWS_REGION", "ap-south-1"),
+        aws_access_key_id=os.getenv("AWS_DYNAMODB_ACCESS_KEY_ID"),
+        aws_secret_access_key=os.getenv("AWS_DYNAMODB_SECRET_ACCESS_KEY"),
+    )
+
+
+# DAX (optional, `dax` extra): used only when DAX_ENDPOINT is set, otherwise these return None.
+# The item and recommendation repositories send only GetItem/BatchGetItem through DAX: its query cache is not
+# invalidated by writes, so queries and writes stay on DynamoDB and cached items may lag writes by the item-cache TTL.
+
+@cache
+def get_dax_resource():
+    _ensure_env()
+    endpoint = os.getenv("DAX_ENDPOINT")
+    if not endpoint:
+        return None
+    from amazondax import AmazonDaxClient
+    return AmazonDaxClient.resource(session=_dynamodb_session(), endpoint_url=endpoint)
+
+
+@cache
+def get_dax_client():
+    _ensure_env()
+    endpoint = os.getenv("DAX_ENDPOINT")
+    if not endpoint:
+        return None
+    from amazondax import AmazonDaxClient
+    return AmazonDaxClient(session=_dynamodb_session(), endpoint_url=endpoint)
+
 
+@cache
 def get_s3_client():
-    return s3_client
\ No newline at end of file
+    _ensure_env()
+    return boto3.client(
+        's3',
+        aws_access_key_id=os.getenv('AWS_S3_ACCESS_KEY_ID'),
+        aws_secret_access_key=os.getenv('AWS_S3_SECRET_ACCESS_KEY'),
+        region_name=os.getenv('AWS_S3_REGION', 'ap-south-1'),
+        config=boto_config,
+    )
@@ -1,31 +1,33 @@
+from functools import lru_cache
+
 from personalize_commons.constants.app_constants import AppConstants
 from recombee_api_client.api_client import RecombeeClient, Region
 
-recombee_api_client = None
-
-intraction_service = None
+_REGION_MAP: dict[str, Region] = {
+    region.name: region for region in (Region.AP_SE, Region.CA_EAST, Region.EU_WEST, Region.US_WEST)
+}
 
 
 def get_recombee_client(tenant: dict[str, str]) -> RecombeeClient:
-    global recombee_api_client
-    if recombee_api_client is None:
-        recombee_api_client = RecombeeClient(
-            database_id=tenant.get(AppConstants.TENANT_DATA_BASE_ID),
-            token=tenant.get(AppConstants.TENANT_PRIVATE_KEY),
-            region=get_region(tenant.get(AppConstants.TENANT_REGION)),
-        )
+    """
+    Return the RecombeeClient for the tenant's database.
+    Clients are cached per (database_id, token, region), so each tenant gets its own client.
+    """
+    return _build_recombee_client(
+        tenant.get(AppConstants.TENANT_DATA_BASE_ID),
+        tenant.get(AppConstants.TENANT_PRIVATE_KEY),
+        tenant.get(AppConstants.TENANT_REGION),
+    )
+
 
-    return recombee_api_client
+@lru_cache(maxsize=128)
+def _build_recombee_client(database_id: str, token: str, region_name: str) -> RecombeeClient:
+    return RecombeeClient(
+        database_id=database_id,
+        token=token,
+        region=get_region(region_name),
+    )
 
 
 def get_region(region_name: str) -> Region | None:
-    match region_name:
-        case Region.AP_SE.name:
-            return Region.AP_SE
-        case Region.CA_EAST.name:
-            return Region.CA_EAST
-        case Region.EU_WEST.name:
-            return Region.EU_WEST
-        case Region.US_WEST.name:
-            return Region.US_WEST
-    return None
+    return _REGION_MAP.get(region_name)
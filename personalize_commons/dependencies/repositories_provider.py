@@ -1,6 +1,7 @@
 # src/dependencies/repositories.py
+from functools import cache
 
-from personalize_commons.repositories.campaign_repository import CampaignRepository
+from personalize_commons.repositories.campaign_repository import CampaignRepository, AsyncCampaignRepository
 from personalize_commons.repositories.intraction_entity_tracking_repository import InteractionTrackingRepository
 from personalize_commons.repositories.intraction_user_tracker_repository import InteractionUserTrackerRepository
 
@@ -9,57 +10,46 @@ from personalize_commons.repositories.recommendation_repository import Recommend
 from personalize_commons.repositories.tenant_repository import TenantRepository
 from personalize_commons.repositories.user_repository import UserRepository
 
-from personalize_commons.dependencies.aws_providers import get_dynamodb_resource, get_dynamodb_client
+from personalize_commons.dependencies.aws_providers import get_dynamodb_resource, get_dynamodb_client, \
+    get_dax_resource, get_dax_client, get_dynamodb_raw_client, get_dynamodb_counter_client
 
-# Create singleton instances
-__user_repository = None
-__campaign_repository = None
-__item_repository = None
-__recommendation_repository = None
-__tenant_repository = None
-__intraction_tracking_repository = None
-__interaction_user_tracking_repository = None
 
+# Each provider is cached, so every repository is a process-wide singleton
 
+@cache
 def get_tenant_repository():
-    global __tenant_repository
-    if __tenant_repository is None:
-        __tenant_repository = TenantRepository(resource=get_dynamodb_resource())
-    return __tenant_repository
+    return TenantRepository(resource=get_dynamodb_resource())
 
+@cache
 def get_user_repository():
-    global __user_repository
-    if __user_repository is None:
-        __user_repository = UserRepository(client=get_dynamodb_client(),resource=get_dynamodb_resource())
-    return __user_repository
+    # PartiQL results are decoded by the repository, so the client skips botocore's response shape parsing
+    return UserRepository(client=get_dynamodb_raw_client(),resource=get_dynamodb_resource())
 
 
+@cache
 def get_campaign_repository():
-    global __campaign_repository
-    if __campaign_repository is None:
-        __campaign_repository = CampaignRepository(resource=get_dynamodb_resource())
-    return __campaign_repository
+    return CampaignRepository(resource=get_dynamodb_resource(), client=get_dynamodb_client())
 
+@cache
+def get_async_campaign_repository():
+    return AsyncCampaignRepository(get_campaign_repository())
+
+@cache
 def get_item_repository():
-    global __item_repository
-    if __item_repository is None:
-        __item_repository = ItemRepository(resource=get_dynamodb_resource())
-    return __item_repository
+    # read-heavy catalog GetItem lookups are served from DAX when configured
+    return ItemRepository(resource=get_dynamodb_resource(), read_resource=get_dax_resource())
 
+@cache
 def get_recommendation_repository():
-    global __recommendation_repository
-    if __recommendation_repository is None:
-        __recommendation_repository = RecommendationRepository(resource=get_dynamodb_resource())
-    return __recommendation_repository
+    # get_recommendation is on every update path; its GetItem is served from DAX when configured
+    return RecommendationRepository(resource=get_dynamodb_resource(), read_resource=get_dax_resource())
 
+@cache
 def get_interaction_tracking_repository()->InteractionTrackingRepository:
-    global __intraction_tracking_repository
-    if __intraction_tracking_repository is None:
-        __intraction_tracking_repository=InteractionTrackingRepository(client=get_dynamodb_client())
-    return __intraction_tracking_repository
+    # month aggregates are re-read on every event; served from DAX when configured
+    # its ADD counter updates must not be re-sent after a read timeout, see dynamodb_counter_config
+    return InteractionTrackingRepository(client=get_dax_client() or get_dynamodb_counter_client())
 
+@cache
 def get_interaction_user_tracking_repository():
-    global __interaction_user_tracking_repository
-    if __interaction_user_tracking_repository is None:
-        __interaction_user_tracking_repository=InteractionUserTrackerRepository(client=get_dynamodb_client())
-    return __interaction_user_tracking_repository
+    return InteractionUserTrackerRepository(client=get_dynamodb_client())
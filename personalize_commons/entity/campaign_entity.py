@@ -1,9 +1,9 @@
-from datetime import datetime
 from enum import Enum
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from uuid import uuid4
 
-from pydantic import BaseModel, Field
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_serializer
 
 from personalize_commons.constants.app_constants import AppConstants
 
@@ -55,11 +55,9 @@ class CampaignEntity(BaseModel):
     created_by: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
 
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-        json_schema_extra  = {
+    model_config = ConfigDict(
+        extra='ignore',
+        json_schema_extra={
             "example": {
                 "PK": "TENANT#tenant123",
                 "SK": "CAMPAIGN#campaign_abc123",
@@ -73,27 +71,67 @@ class CampaignEntity(BaseModel):
                 "created_at": "2023-01-01T00:00:00.000Z",
                 "updated_at": "2023-01-01T00:00:00.000Z"
             }
-        }
+        },
+    )
+
+    @field_serializer('status')
+    def _serialize_status(self, status: CampaignStatus) -> str:
+        return status.value
 
     def to_dynamodb_item(self) -> Dict[str, Any]:
         """Convert to DynamoDB item format."""
-        item = self.model_dump()
-
-        # Convert enums to strings
-        if 'status' in item and item['status']:
-            item['status'] = item['status'].value
-        return item
+        # status is converted to its string value by _serialize_status
+        return self.model_dump()
 
     @classmethod
     def from_dynamodb_item(cls, item: Dict[str, Any]) -> 'CampaignEntity':
         """Create from DynamoDB item."""
-        # Convert DynamoDB format to our model
-        if 'status' in item and item['status']:
-            item['status'] = CampaignStatus(item['status'])
-        # if DBConstants.CREATED_AT in item and item[DBConstants.CREATED_AT]:
-        #     item[DBConstants.CREATED_AT] = to_ist_iso( item[DBConstants.CREATED_AT])
-        #
-        # if DBConstants.UPDATED_AT in item and item[DBConstants.UPDATED_AT]:
-        #     item[DBConstants.UPDATED_AT] = to_ist_iso(item[DBConstants.UPDATED_AT])
-
-        return cls(**item)
\ No newline at end of file
+        # status string is validated into CampaignStatus by pydantic
+        return cls.model_validate(item)
+
+    def to_ddb_lowlevel(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Convert to a low-level client item ({'S': ...} attribute values).
+        String fields are encoded directly; only the free-form map fields go through TypeSerializer.
+        """
+        data = self.__dict__
+        item = {field: _NULL if data[field] is None else {'S': data[field]} for field in _STR_FIELDS}
+        item['status'] = {'S': self.status.value}
+        for field in _MAP_FIELDS:
+            value = data[field]
+            item[field] = _NULL if value is None else _SERIALIZER.serialize(value)
+        return item
+
+    @classmethod
+    def from_ddb_lowlevel(cls, item: Dict[str, Dict[str, Any]]) -> 'CampaignEntity':
+        """Create from a low-level client item; string and null attributes skip TypeDeserializer."""
+        data = {}
+        for field, value in item.items():
+            if 'S' in value:
+                data[field] = value['S']
+            elif 'NULL' in value:
+                data[field] = None
+            else:
+                data[field] = _DESERIALIZER.deserialize(value)
+        return cls.model_validate(data)
+
+    @classmethod
+    def from_dynamodb_items(cls, items: List[Dict[str, Any]]) -> List['CampaignEntity']:
+        """
+        Create entities from a page of DynamoDB items in one validation call.
+        The list is validated inside pydantic-core instead of one Python-level call per item.
+        """
+        return _CAMPAIGN_LIST_ADAPTER.validate_python(items)
+
+
+# attribute types are fixed by the schema, so only the map fields need boto3's recursive (de)serializer
+_STR_FIELDS = (
+    'campaign_id', 'campaign_name', 'industry_type', 'tenant_id', 'item_id', 'logic', 'scenario',
+    'description', 'recommendation_logic', 'start_date', 'end_date', 'created_at', 'updated_at', 'created_by',
+)
+_MAP_FIELDS = ('target_segment', 'message_template', 'filters', 'metadata')
+_NULL = {'NULL': True}
+_SERIALIZER = TypeSerializer()
+_DESERIALIZER = TypeDeserializer()
+
+_CAMPAIGN_LIST_ADAPTER = TypeAdapter(List[CampaignEntity])
@@ -1,13 +1,15 @@
 from typing import Dict
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
-from personalize_commons.utils.datetime_utils import ist_now
+from personalize_commons.utils.datetime_utils import ist_month
 
 
 class InteractionTrackingEntity(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     tenant_id: str = Field(..., description="Tenant/User ID")
-    month: str = Field(default_factory=lambda: ist_now().strftime("%Y-%m"),
+    month: str = Field(default_factory=ist_month,
                        description="Month in YYYY-MM format (IST)")
     interactions: Dict[str, int] = Field(default_factory=dict,
                                          description="Map of event type to count")
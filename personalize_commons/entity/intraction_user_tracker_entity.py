@@ -1,6 +1,8 @@
-from pydantic import BaseModel, Field
-from personalize_commons.utils.datetime_utils import ist_now
-from typing import Optional
+from functools import cached_property
+
+from pydantic import BaseModel, ConfigDict, Field
+from personalize_commons.utils.datetime_utils import ist_month
+from typing import Any, Dict, Optional
 
 
 class IntractionUserTrackerEntity(BaseModel):
@@ -8,19 +10,30 @@ class IntractionUserTrackerEntity(BaseModel):
     Represents a single record in the intraction_user_tracker table.
     Each row marks one unique end-user for a given tenant and month.
     """
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     tenant_id: str = Field(..., description="Tenant ID")
     user_id: str = Field(..., description="End-user ID inside tenant")
     month: str = Field(
-        default_factory=lambda: ist_now().strftime("%Y-%m"),
+        default_factory=ist_month,
         description="Month in YYYY-MM format (IST)"
     )
     expire_at: Optional[int] = Field(
         None, description="Epoch timestamp for TTL (auto-expire in DynamoDB)"
     )
 
-    @property
+    @cached_property
     def tenant_month(self) -> str:
         """
         Composite PK for DynamoDB (tenant_id + month).
+        Computed once per instance; safe to cache since the entity is frozen.
+        Not a field, so model_dump() still returns only the stored attributes.
         """
         return f"{self.tenant_id}#{self.month}"
+
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> 'IntractionUserTrackerEntity':
+        copy = super().model_copy(update=update, deep=deep)
+        if update:
+            # the cached tenant_month is copied with __dict__; recompute it from the updated fields
+            copy.__dict__.pop('tenant_month', None)
+        return copy
@@ -1,10 +1,11 @@
-import base64
+from collections import Counter
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Dict, Any, List
+from operator import attrgetter
+from typing import Optional, Dict, Any, List, Iterable
 from uuid import uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_serializer
 
 from personalize_commons.entity.campaign_entity import CampaignEntity
 from personalize_commons.utils.datetime_utils import ist_now
@@ -33,19 +34,23 @@ class Flow(str, Enum):
     NOTIFY_FAILED = "recommendation.notify.failed"
 
 
+# enum member -> stored string, looked up by the serializers instead of reading .value per member
+_STATUS_VALUES = {member: member.value for member in RecommendationStatus}
+_FLOW_VALUES = {member: member.value for member in Flow}
+
+
 class RecommendationMetrics(BaseModel):
-    segment_matched_users: int = Field(..., description="Number of users matched to the target segment",
-                                       alias="segment_matched_users")
-    default_users: int = Field(..., description="if target segment is not provided, to fetch the default users from DB",
-                               alias="default_users")
-    ai_recommended_items: int = Field(..., description="Number of items recommended", alias="ai_recommended_items")
-    ai_recommended_users: int = Field(..., description="Number of items recommended", alias="ai_recommended_users")
-    recommended_users: int = Field(..., description="Number of users recommended", alias="recommended_users")
-    recommended_items: int = Field(..., description="Number of items recommended", alias="recommended_items")
-    failed_recommendations: int = Field(..., description="Number of users failed in ai", alias="failed_recommendations")
-    message_success_count: int = Field(..., description="Number of successfully processed messages",
-                                       alias="message_success_count")
-    message_failed_count: int = Field(..., description="Number of failed messages", alias="message_failed_count")
+    model_config = ConfigDict(extra='ignore')
+
+    segment_matched_users: int = Field(..., description="Number of users matched to the target segment")
+    default_users: int = Field(..., description="if target segment is not provided, to fetch the default users from DB")
+    ai_recommended_items: int = Field(..., description="Number of items recommended")
+    ai_recommended_users: int = Field(..., description="Number of items recommended")
+    recommended_users: int = Field(..., description="Number of users recommended")
+    recommended_items: int = Field(..., description="Number of items recommended")
+    failed_recommendations: int = Field(..., description="Number of users failed in ai")
+    message_success_count: int = Field(..., description="Number of successfully processed messages")
+    message_failed_count: int = Field(..., description="Number of failed messages")
 
     @staticmethod
     def empty():
@@ -61,12 +66,51 @@ class RecommendationMetrics(BaseModel):
             message_failed_count=0,
         )
 
+    def to_counter(self) -> Counter:
+        return Counter(self.__dict__)
+
+    @classmethod
+    def from_counter(cls, counter: Counter) -> 'RecommendationMetrics':
+        """Build metrics from a Counter (e.g. sum(counters, Counter())); missing counters are 0."""
+        return cls(**{field: counter[field] for field in cls.model_fields})
+
+    @classmethod
+    def sum(cls, metrics: Iterable['RecommendationMetrics']) -> 'RecommendationMetrics':
+        """Field-wise total of many metrics, one C-level sum() per field (see MetricsAggregator)."""
+        return MetricsAggregator(metrics).totals()
+
+
+class MetricsAggregator:
+    """
+    Column-wise (structure of arrays) rollup of many RecommendationMetrics,
+    e.g. per-tenant or per-campaign totals for dashboards.
+    Each counter becomes one tuple, so totals are a single C-level sum() per column
+    instead of a Python loop over every field of every row.
+    """
+    FIELDS = tuple(RecommendationMetrics.model_fields)
+    _row = attrgetter(*FIELDS)
+
+    def __init__(self, metrics: Iterable[RecommendationMetrics]):
+        rows = [self._row(m) for m in metrics]
+        self.count = len(rows)
+        columns = zip(*rows) if rows else ((),) * len(self.FIELDS)
+        self.columns: Dict[str, tuple] = dict(zip(self.FIELDS, columns))
+
+    def totals(self) -> RecommendationMetrics:
+        return RecommendationMetrics(**{field: sum(column) for field, column in self.columns.items()})
+
+    def means(self) -> Dict[str, float]:
+        if not self.count:
+            return {field: 0.0 for field in self.FIELDS}
+        return {field: sum(column) / self.count for field, column in self.columns.items()}
+
 
 class RecommendationEntity(BaseModel):
     """
     Entity representing a recommendation job in the system.
     Uses tenant_id as partition key and recommendation_id as sort key in DynamoDB.
     """
+    model_config = ConfigDict(extra='ignore')
 
     # Required fields
     tenant_id: str = Field(..., description="Tenant identifier (partition key)")
@@ -92,51 +136,33 @@ class RecommendationEntity(BaseModel):
     # Additional metadata
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata for the recommendation job")
 
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-
-    def to_dynamodb_item(self) -> Dict[str, Any]:
-        """Convert the entity to a DynamoDB item."""
-        item = self.model_dump(exclude_none=True)
+    @field_serializer('status')
+    def _serialize_status(self, status: RecommendationStatus) -> str:
+        return _STATUS_VALUES[status]
 
-        # Convert enums to strings
-        if 'status' in item:
-            item['status'] = item['status'].value
+    @field_serializer('flows')
+    def _serialize_flows(self, flows: List[Flow]) -> List[str]:
+        return [_FLOW_VALUES[flow] for flow in flows]
 
-        # Convert datetime objects to ISO format strings
-        for field in ['created_at', 'updated_at', 'completed_at']:
-            if field in item and item[field] is not None:
-                if not isinstance(item[field], str):
-                    item[field] = item[field].isoformat()
+    @field_serializer('created_at', 'updated_at', 'completed_at')
+    def _serialize_datetime(self, value: Optional[datetime]) -> Optional[str]:
+        return value.isoformat() if value else None
 
-        return item
+    def to_dynamodb_item(self) -> Dict[str, Any]:
+        """Convert the entity to a DynamoDB item."""
+        # status/flows are converted by their serializers, timestamps by _serialize_datetime
+        return self.model_dump(exclude_none=True)
 
     @classmethod
     def from_dynamodb_item(cls, item: Dict[str, Any]) -> 'RecommendationEntity':
         """Create an entity from a DynamoDB item."""
-        # Convert string status back to enum
-        if 'status' in item and isinstance(item['status'], str):
-            item['status'] = RecommendationStatus(item['status'])
-        #
-        # if DBConstants.CREATED_AT in item and item[DBConstants.CREATED_AT]:
-        #     item[DBConstants.CREATED_AT] = to_ist_iso( item[DBConstants.CREATED_AT])
-        #
-        # if DBConstants.UPDATED_AT in item and item[DBConstants.UPDATED_AT]:
-        #     item[DBConstants.UPDATED_AT] = to_ist_iso(item[DBConstants.UPDATED_AT])
-        #
-        # if DBConstants.COMPLETED_AT in item and item[DBConstants.COMPLETED_AT]:
-        #     item[DBConstants.COMPLETED_AT] = to_ist_iso(item[DBConstants.COMPLETED_AT])
-
-        if 'recom_file_key' in item and item['recom_file_key'] is not None:
-            item['recom_file_key'] = base64.urlsafe_b64encode(str(item['recom_file_key']).encode())
-        # Convert ISO format strings back to datetime objects
-        for field in ['created_at', 'updated_at', 'completed_at']:
-            if field in item and item[field] is not None and isinstance(item[field], str):
-                item[field] = datetime.fromisoformat(item[field])
-
-        return cls(**item)
+        # status and ISO timestamp strings are parsed by pydantic validation
+        return cls.model_validate(item)
+
+    @classmethod
+    def from_dynamodb_items(cls, items: List[Dict[str, Any]]) -> List['RecommendationEntity']:
+        """Create entities from a page of DynamoDB items in one validation call."""
+        return _RECOMMENDATION_LIST_ADAPTER.validate_python(items)
 
     @staticmethod
     def of(campaign: CampaignEntity, status=RecommendationStatus.RUNNING, flows=None) -> 'RecommendationEntity':
@@ -151,13 +177,18 @@ class RecommendationEntity(BaseModel):
         if flows is None:
             flows = [Flow.RECOMMENDATION_TRIGGERED]
 
+        now = ist_now()
         return RecommendationEntity(
             tenant_id=campaign.tenant_id,
             recommendation_id=f"recommendation_{uuid4()}",
             campaign_id=campaign.campaign_id,
             status=status,  # Use the status parameter instead of hardcoded value
-            metadata=campaign.model_dump(),
-            created_at=ist_now(),
-            updated_at=ist_now(),
+            # shallow snapshot of the campaign fields; nested dicts are shared, not copied
+            metadata=campaign.__dict__.copy(),
+            created_at=now,
+            updated_at=now,
             flows=flows,
         )
+
+
+_RECOMMENDATION_LIST_ADAPTER = TypeAdapter(List[RecommendationEntity])
@@ -1,10 +1,55 @@
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from string import Formatter
+from typing import Dict, Any, List, Optional, Tuple
 
-from pydantic import BaseModel, Field, ValidationError
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+_CONVERTERS = {None: None, 'r': repr, 's': str, 'a': ascii}
+
+
+@lru_cache(maxsize=1024)
+def _compile_template(template: str) -> Optional[Tuple[Tuple[str, Optional[str], Optional[str], str], ...]]:
+    """
+    Parse a str.format template once into (literal, field, conversion, format_spec) parts.
+    Returns None when the template uses anything beyond named fields with a static spec
+    (positional/attribute/index fields, nested specs); those are rendered with str.format.
+    """
+    parts = []
+    for literal, field, format_spec, conversion in Formatter().parse(template):
+        if field is not None and (not field.isidentifier() or '{' in format_spec or conversion not in _CONVERTERS):
+            return None
+        parts.append((literal, field, conversion, format_spec))
+    return tuple(parts)
+
+
+@lru_cache(maxsize=1024)
+def _required_variables(variables: Tuple[str, ...]) -> frozenset:
+    """Set of required variable names, built once per variables list for the missing-variable check."""
+    return frozenset(variables)
+
+
+def _render(template: str, values: Dict[str, Any]) -> str:
+    parts = _compile_template(template)
+    if parts is None:
+        return template.format_map(values)
+
+    out = []
+    append = out.append
+    for literal, field, conversion, format_spec in parts:
+        append(literal)
+        if field is not None:
+            value = values[field]
+            if conversion:
+                value = _CONVERTERS[conversion](value)
+            append(format(value, format_spec))
+    return ''.join(out)
 
 
 class MessageTemplate(BaseModel):
     """Model for message templates with variable substitution."""
+    # frozen blocks field reassignment; model_copy(update=...) still builds new instances without re-validation
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     channel: str = Field(..., description="Communication channel (e.g., WhatsApp, Email, SMS)")
     variables: List[str] = Field(
         default_factory=list,
@@ -15,7 +60,6 @@ class MessageTemplate(BaseModel):
         None,
         description="Message subject (optional, used in email)"
     )
-
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'MessageTemplate':
         """
@@ -54,17 +98,18 @@ class MessageTemplate(BaseModel):
             ValueError: If required variables are missing
         """
         # Check for missing required variables
-        missing_vars = [var for var in self.variables if var not in kwargs]
-        if missing_vars:
+        # derived from the current variables, so copies made with model_copy(update=...) are checked correctly
+        if not kwargs.keys() >= _required_variables(tuple(self.variables)):
+            missing_vars = [var for var in self.variables if var not in kwargs]
             raise ValueError(f"Missing required variables: {', '.join(missing_vars)}")
 
-        # Render the message body
-        rendered_body = self.body.format(**kwargs)
+        # Render the message body (template parsing is cached per template string)
+        rendered_body = _render(self.body, kwargs)
 
         # If subject exists, render it as well
         rendered_subject = None
         if self.subject:
-            rendered_subject = self.subject.format(**kwargs)
+            rendered_subject = _render(self.subject, kwargs)
 
         return {
             'channel': self.channel,
@@ -1,5 +1,4 @@
-from pydantic import Field
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class TenantResponseModel(BaseModel):
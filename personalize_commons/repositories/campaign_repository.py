@@ -1,30 +1,39 @@
+import asyncio
 import logging
-import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, Iterable, List
 
 from botocore.exceptions import ClientError
 
 from personalize_commons.constants.app_constants import AppConstants
+from personalize_commons.constants.context import run_in_executor_with_ctx
 from personalize_commons.constants.db_constants import DBConstants
 from personalize_commons.entity.campaign_entity import CampaignEntity
 from personalize_commons.utils.datetime_utils import ist_now_iso
+from personalize_commons.dependencies.aws_providers import get_env, get_table
+from personalize_commons.utils.dynamodb_expressions import build_projection, conditional_update
+from personalize_commons.utils.dynamodb_pagination import paginate
 
 logger = logging.getLogger(__name__)
 
 
 class CampaignRepository:
-    def __init__(self, resource):
+    def __init__(self, resource, client=None):
         self.resource = resource
-        self.campaign_table = self.resource.Table(os.getenv('DYNAMODB_TABLE_CAMPAIGNS', 'campaigns'))
+        # low-level client for single-item put/get: items are encoded by the entity, not by TypeSerializer
+        self.client = client if client is not None else resource.meta.client
+        self.table_name = get_env('DYNAMODB_TABLE_CAMPAIGNS', 'campaigns')
+        self.campaign_table = get_table(self.resource, self.table_name)
 
     def create_campaign(self, campaign: CampaignEntity) -> CampaignEntity:
         try:
-            campaign.created_at = ist_now_iso()
-            campaign.updated_at = ist_now_iso()
-            item = campaign.to_dynamodb_item()
-            self.campaign_table.put_item(Item=item)
-            return CampaignEntity.from_dynamodb_item(item)
+            now = ist_now_iso()
+            campaign.created_at = now
+            campaign.updated_at = now
+            self.client.put_item(TableName=self.table_name, Item=campaign.to_ddb_lowlevel())
+            # the entity already holds exactly what was written; no need to re-validate the item
+            return campaign
         except ClientError as e:
             print("Full error:", e)
             error_msg = f"Error creating campaign: {e.response['Error']['Message']}"
@@ -36,16 +45,17 @@ class CampaignRepository:
 
     def get_campaign(self, campaign_id: str, tenant_id: str) -> Optional[CampaignEntity]:
         try:
-            response = self.campaign_table.get_item(
+            response = self.client.get_item(
+                TableName=self.table_name,
                 Key={
-                    AppConstants.TENANT_ID: tenant_id,
-                    AppConstants.CAMPAIGN_ID: campaign_id
+                    AppConstants.TENANT_ID: {'S': tenant_id},
+                    AppConstants.CAMPAIGN_ID: {'S': campaign_id}
                 }
             )
             item = response.get('Item')
             if item is None:
                 return None
-            return CampaignEntity.from_dynamodb_item(item)
+            return CampaignEntity.from_ddb_lowlevel(item)
         except ClientError as e:
             error_msg = f"Error getting campaign: {e.response['Error']['Message']}"
             print("Full error:", e.response)
@@ -57,50 +67,24 @@ class CampaignRepository:
         Update a campaign by ID with the provided data.
         Returns the updated campaign if successful, None otherwise.
         """
-        try:
-            # First get the existing campaign to merge with updates
-            existing = self.get_campaign(campaign_id, tenant_id)
-            if not existing:
-                return None
-
-            # Convert entity to dict, update with new values, and back to entity
-            update_dict = existing.model_dump()
-            update_dict.update({
-                k: v for k, v in update_data.items()
-                if v is not None and k in update_dict
-            })
-
-            # Ensure tenant_id remains unchanged
-            if AppConstants.TENANT_ID in update_dict and update_dict['tenant_id'] != tenant_id:
-                raise ValueError("Cannot change tenant_id of a campaign")
-
-            # Convert back to entity to validate
-            updated_entity = CampaignEntity(**update_dict)
+        # Ensure tenant_id remains unchanged
+        if update_data.get(AppConstants.TENANT_ID, tenant_id) != tenant_id:
+            raise ValueError("Cannot change tenant_id of a campaign")
 
-            # Prepare update expression
-            update_expression = 'SET ' + ', '.join(f'#{k} = :{k}' for k in update_data.keys())
-            expression_attribute_names = {f'#{k}': k for k in update_data.keys()}
-            expression_attribute_values = {f':{k}': v for k, v in update_data.items()}
+        # Only known, non-key fields with a value are written
+        update_data = {
+            k: v for k, v in update_data.items()
+            if v is not None and k in CampaignEntity.model_fields
+            and k not in (AppConstants.TENANT_ID, AppConstants.CAMPAIGN_ID, DBConstants.UPDATED_AT)
+        }
 
-            # Add updated_at timestamp
-            update_expression += ', #updated_at = :updated_at'
-            expression_attribute_names['#updated_at'] = 'updated_at'
-            expression_attribute_values[':updated_at'] = ist_now_iso()
-
-            # Execute update
-            self.campaign_table.update_item(
-                Key={
-                    'tenant_id': str(tenant_id),
-                    'campaign_id': campaign_id
-                },
-                UpdateExpression=update_expression,
-                ExpressionAttributeNames=expression_attribute_names,
-                ExpressionAttributeValues=expression_attribute_values,
-                ReturnValues='ALL_NEW'
+        try:
+            return conditional_update(
+                self.campaign_table,
+                {AppConstants.TENANT_ID: str(tenant_id), AppConstants.CAMPAIGN_ID: campaign_id},
+                update_data,
+                CampaignEntity,
             )
-
-            return updated_entity
-
         except ClientError as e:
             logger.error(f"Error updating campaign: {str(e)}")
             raise
@@ -138,7 +122,8 @@ class CampaignRepository:
             status: str = None,
             page_size: int = 10,
             last_evaluated_key: dict = None,
-            sort_order: str = "desc"
+            sort_order: str = "desc",
+            projection: Optional[List[str]] = None
     ) -> dict:
         """
         Get campaigns by update date range and status using appropriate LSI.
@@ -152,62 +137,18 @@ class CampaignRepository:
             page_size: Number of items per page
             last_evaluated_key: Pagination token from previous query
             sort_order: Sort order ('asc' or 'desc')
+            projection: Optional attribute names to fetch (e.g. for listings); items are then
+                returned as raw dicts instead of CampaignEntity, since they are partial
 
         Returns:
             Dictionary containing items and pagination info
         """
         try:
-            # Base key condition
-            key_condition = 'tenant_id = :tenant_id'
-            expr_attr_values = {':tenant_id': tenant_id}
-            expr_attr_names = {}
-            filter_expression = []
-
-            # Determine which index to use based on parameters
-            index_name = None
-            # This will exclude all records from July 15, unless they were created exactly at midnight (00:00:00) — which is very unlikely.
-            if end_date is not None:
-                end_date = end_date + timedelta(days=1)
-            # If status is provided but no date range, use StatusIndex
-            if status and not (start_date or end_date):
-                index_name = DBConstants.STAUS_AT_INDEX
-                key_condition += ' AND #status = :status'
-                expr_attr_names['#status'] = 'status'
-                expr_attr_values[':status'] = status
-
-
-
-            # Otherwise, use UpdatedAtIndex (default)
-            else:
-                index_name = DBConstants.UPDATED_AT_INDEX
-                # Add date range to key condition if provided
-                if start_date and end_date:
-                    key_condition += ' AND #updated_at BETWEEN :start_date AND :end_date'
-                    expr_attr_names['#updated_at'] = 'updated_at'
-                    expr_attr_values[':start_date'] = start_date.isoformat()
-                    expr_attr_values[':end_date'] = end_date.isoformat()
-
-                # Add status as filter if provided
-                if status:
-                    filter_expression.append('#status = :status')
-                    expr_attr_names['#status'] = 'status'
-                    expr_attr_values[':status'] = status
-
-            # Build query parameters
-            query_params = {
-                'IndexName': index_name,
-                'KeyConditionExpression': key_condition,
-                'ExpressionAttributeValues': expr_attr_values,
-                'Limit': page_size,
-                'ScanIndexForward': sort_order.lower() == 'asc'
-            }
-
-            if expr_attr_names:
-                query_params['ExpressionAttributeNames'] = expr_attr_names
-
-            # Add filter expression if we have any filters
-            if filter_expression:
-                query_params['FilterExpression'] = ' AND '.join(filter_expression)
+            query_params = self._build_updated_at_query(tenant_id, start_date, end_date, status, page_size, sort_order)
+            if projection:
+                projection_expression, projection_names = build_projection(projection)
+                query_params['ProjectionExpression'] = projection_expression
+                query_params.setdefault('ExpressionAttributeNames', {}).update(projection_names)
 
             if last_evaluated_key:
                 query_params['ExclusiveStartKey'] = last_evaluated_key
@@ -215,8 +156,10 @@ class CampaignRepository:
             # Execute query
             response = self.campaign_table.query(**query_params)
 
-            # Convert items to entities
-            items = [CampaignEntity.from_dynamodb_item(item) for item in response.get('Items', [])]
+            # Convert items to entities (projected items are partial, so they stay raw dicts)
+            items = response.get('Items', [])
+            if not projection:
+                items = CampaignEntity.from_dynamodb_items(items)
 
             return {
                 AppConstants.ITEMS: items,
@@ -228,3 +171,109 @@ class CampaignRepository:
         except Exception as e:
             logging.error(f"Error getting campaigns: {str(e)}")
             raise
+
+    def iter_campaigns_by_updated_at(
+            self,
+            tenant_id: str,
+            start_date: datetime = None,
+            end_date: datetime = None,
+            status: str = None,
+            page_size: int = 100,
+            sort_order: str = "desc"
+    ) -> Iterator[CampaignEntity]:
+        """
+        Lazily yield every matching campaign, following LastEvaluatedKey page by page.
+        Only one page is held in memory at a time; same filters as get_campaigns_by_updated_at.
+        """
+        query_params = self._build_updated_at_query(tenant_id, start_date, end_date, status, page_size, sort_order)
+        for response in paginate(self.campaign_table.query, **query_params):
+            for item in response.get('Items', []):
+                yield CampaignEntity.from_dynamodb_item(item)
+
+    @staticmethod
+    def _build_updated_at_query(
+            tenant_id: str,
+            start_date: Optional[datetime],
+            end_date: Optional[datetime],
+            status: Optional[str],
+            page_size: int,
+            sort_order: str
+    ) -> Dict[str, Any]:
+        # Base key condition
+        key_condition = 'tenant_id = :tenant_id'
+        expr_attr_values = {':tenant_id': tenant_id}
+        expr_attr_names = {}
+        filter_expression = []
+
+        # This will exclude all records from July 15, unless they were created exactly at midnight (00:00:00) — which is very unlikely.
+        if end_date is not None:
+            end_date = end_date + timedelta(days=1)
+        # If status is provided but no date range, use StatusIndex
+        if status and not (start_date or end_date):
+            index_name = DBConstants.STAUS_AT_INDEX
+            key_condition += ' AND #status = :status'
+            expr_attr_names['#status'] = 'status'
+            expr_attr_values[':status'] = status
+
+        # Otherwise, use UpdatedAtIndex (default)
+        else:
+            index_name = DBConstants.UPDATED_AT_INDEX
+            # Add date range to key condition if provided
+            if start_date and end_date:
+                key_condition += ' AND #updated_at BETWEEN :start_date AND :end_date'
+                expr_attr_names['#updated_at'] = 'updated_at'
+                expr_attr_values[':start_date'] = start_date.isoformat()
+                expr_attr_values[':end_date'] = end_date.isoformat()
+
+            # Add status as filter if provided
+            if status:
+                filter_expression.append('#status = :status')
+                expr_attr_names['#status'] = 'status'
+                expr_attr_values[':status'] = status
+
+        # Build query parameters
+        query_params = {
+            'IndexName': index_name,
+            'KeyConditionExpression': key_condition,
+            'ExpressionAttributeValues': expr_attr_values,
+            'Limit': page_size,
+            'ScanIndexForward': sort_order.lower() == 'asc'
+        }
+
+        if expr_attr_names:
+            query_params['ExpressionAttributeNames'] = expr_attr_names
+
+        # Add filter expression if we have any filters
+        if filter_expression:
+            query_params['FilterExpression'] = ' AND '.join(filter_expression)
+
+        return query_params
+
+
+class AsyncCampaignRepository:
+    """
+    asyncio facade over CampaignRepository for multi-tenant batch jobs (admin sweeps, metrics reconciliation).
+    Each call runs the blocking boto3 call on the repository's own thread pool (max_concurrency workers,
+    submitted with tenant_id_ctx), so many DynamoDB round trips are in flight at once instead of one after another.
+    The pool is not tied to an event loop, so one instance can serve successive asyncio.run() calls.
+    """
+
+    def __init__(self, repository: CampaignRepository, max_concurrency: int = 50):
+        self.repository = repository
+        # sized to the boto3 connection pool (max_pool_connections); asyncio.to_thread's default executor
+        # would cap the fan-out at min(32, cpu + 4) threads
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='async-campaigns')
+
+    async def _run(self, fn, *args):
+        return await asyncio.wrap_future(run_in_executor_with_ctx(self._executor, fn, *args))
+
+    async def get_campaign(self, campaign_id: str, tenant_id: str) -> Optional[CampaignEntity]:
+        return await self._run(self.repository.get_campaign, campaign_id, tenant_id)
+
+    async def update_campaign(self, campaign_id: str, update_data: Dict[str, Any], tenant_id: str) -> Optional[
+        CampaignEntity]:
+        return await self._run(self.repository.update_campaign, campaign_id, update_data, tenant_id)
+
+    async def get_campaigns(self, campaign_ids: Iterable[str], tenant_id: str) -> List[Optional[CampaignEntity]]:
+        """Fetch campaigns concurrently; results are in the order of campaign_ids (None where missing)."""
+        return await asyncio.gather(*(self.get_campaign(campaign_id, tenant_id) for campaign_id in campaign_ids))
@@ -1,9 +1,110 @@
+import atexit
 import logging
-import os
+import threading
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
 from personalize_commons.constants.app_constants import AppConstants
+from personalize_commons.constants.context import run_in_executor_with_ctx
 from personalize_commons.constants.db_constants import DBConstants
 from personalize_commons.entity.intraction_tracking_entity import InteractionTrackingEntity
-from personalize_commons.utils.datetime_utils import ist_now
+from personalize_commons.utils.datetime_utils import ist_month
+from personalize_commons.utils.ttl_cache import MISSING, TTLCache
+from personalize_commons.dependencies.aws_providers import get_env
+
+
+@lru_cache(maxsize=512)
+def _build_update_expr(event_types: Tuple[str, ...], value_slots: Tuple[int, ...]) -> Tuple[str, Dict[str, str]]:
+    """
+    Build the UpdateExpression and ExpressionAttributeNames for a set of event types.
+    value_slots[i] is the index of the :vN alias holding event_types[i]'s increment,
+    so events with the same increment share one value alias.
+    """
+    updates = []
+    # "#i" stands for the interactions map, so the path costs 2 bytes per event instead of 13
+    expr_attr_names = {"#i": "interactions"}
+    for i, (event_type, slot) in enumerate(zip(event_types, value_slots)):
+        event_alias = f"#e{i}"
+        expr_attr_names[event_alias] = event_type
+        # ADD starts missing map keys at 0
+        updates.append(f"#i.{event_alias} :v{slot}")
+    return "ADD " + ", ".join(updates), expr_attr_names
+
+
+def _build_update_params(event_increments: Dict[str, int]) -> Tuple[str, Dict[str, str], Dict[str, Dict[str, str]]]:
+    """
+    UpdateExpression, ExpressionAttributeNames and ExpressionAttributeValues for the increments.
+    Each distinct increment value is sent once (bursty batches are mostly 1s); the expression
+    template is cached per (event types, value pattern), so only the values are built per call.
+    """
+    event_types = tuple(sorted(event_increments))
+    slot_by_value: Dict[int, int] = {}
+    value_slots = tuple(slot_by_value.setdefault(event_increments[event_type], len(slot_by_value))
+                        for event_type in event_types)
+    update_expr, expr_attr_names = _build_update_expr(event_types, value_slots)
+    expr_attr_values = {f":v{slot}": {"N": str(value)} for value, slot in slot_by_value.items()}
+    return update_expr, expr_attr_names, expr_attr_values
+
+
+@lru_cache(maxsize=50_000)
+def _pk_key(tenant_id: str, month: str) -> Dict[str, Dict[str, str]]:
+    """Low-level Key for a (tenant, month) record; shared between calls, so it must not be mutated."""
+    return {"tenant_id": {"S": str(tenant_id)}, "month": {"S": str(month)}}
+
+
+def _is_missing_interactions_map(error: ClientError) -> bool:
+    # ADD on a nested path fails with this ValidationException when the interactions map (or the item) does not
+    # exist yet; other ValidationExceptions (type mismatch, item size limit, ...) would fail the seed write too
+    error_info = error.response["Error"]
+    return (error_info["Code"] == "ValidationException"
+            and "document path provided in the update expression is invalid" in error_info.get("Message", ""))
+
+
+# repositories with increments not yet flushed; held only until flush(), so idle repositories are not pinned
+_buffered_repositories: set = set()
+
+
+@atexit.register
+def _flush_buffered_repositories():
+    for repository in list(_buffered_repositories):
+        repository.flush()
+
+
+class PendingIncrements:
+    """
+    Request-scoped increment buffer, see InteractionTrackingRepository.buffer().
+    Increments are summed per (tenant, month, event type) in memory and written by flush()
+    in one update per (tenant, month), or one TransactWriteItems call across tenants.
+    """
+
+    def __init__(self, repository: 'InteractionTrackingRepository'):
+        self.repository = repository
+        self.increments: defaultdict[Tuple[str, str], Counter] = defaultdict(Counter)
+
+    def add(self, tenant_id: str, event_type: str, count: int = 1, month: str = None):
+        self.increments[(tenant_id, month or ist_month())][event_type] += count
+
+    def flush(self) -> dict:
+        pending, self.increments = self.increments, defaultdict(Counter)
+        if not pending:
+            return {"ok": True, "records": 0}
+        return self.repository.update_interactions_bulk(
+            (tenant_id, month, counter) for (tenant_id, month), counter in pending.items()
+        )
+
+    def __enter__(self) -> 'PendingIncrements':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # increments recorded before an error still happened, so they are written either way
+        self.flush()
+        return False
+
 
 class InteractionTrackingRepository:
     """
@@ -14,12 +115,38 @@ class InteractionTrackingRepository:
         - interactions (M: str -> N)
         - unique_users (N)
     """
+    # buffered increments are flushed once this many events are pending
+    FLUSH_THRESHOLD = 50
+    # TransactWriteItems accepts at most 100 operations per call
+    TRANSACT_MAX_ITEMS = 100
+    # chunks of a bulk update written concurrently
+    BULK_MAX_WORKERS = 8
+    # get_interactions results are reused for this many seconds (writes through this repository evict them)
+    CACHE_TTL_SECONDS = 5
+
     def __init__(self, client):
         self.dynamodb = client
-        self.table_name = os.getenv('INTERACTION_TRACKING_TABLE', 'interaction_tracking')
+        self.table_name = get_env('INTERACTION_TRACKING_TABLE', 'interaction_tracking')
+        # pending increments per (tenant_id, month), see buffer_interactions()
+        self._buffer: defaultdict[Tuple[str, str], Counter] = defaultdict(Counter)
+        # events in _buffer, kept as a running total so buffer_interactions does not re-sum it
+        self._pending = 0
+        self._buffer_lock = threading.Lock()
+        # (tenant_id, month) -> InteractionTrackingEntity, see get_interactions()
+        self.cache = TTLCache(maxsize=1024, ttl=self.CACHE_TTL_SECONDS)
+
+    def invalidate(self, tenant_id: str, month: str = None):
+        """Evict the cached get_interactions result for (tenant, month)."""
+        self.cache.pop((tenant_id, month or ist_month()))
 
-    def update_interactions(self, tenant_id: str, event_increments: dict, month: str = None):
+    def update_interactions(self, tenant_id: str, event_increments: dict, month: str = None,
+                            return_updated: bool = False, unique_users_increment: int = 0):
         '''
+        Returns {"ok": True}; pass return_updated=True to get the updated counters (ReturnValues=UPDATED_NEW)
+        instead. Failures return {"ok": False, "error": ...}.
+        unique_users_increment is added to unique_users in the same UpdateItem, saving the separate
+        increment_unique_users call for a new user's first event.
+
         usage
         repo = InteractionRepository(table_name="Interactions")
 
@@ -33,99 +160,261 @@ class InteractionTrackingRepository:
         record = repo.get_interactions("tenant123", "2025-08")
         '''
         if month is None:
-            month = ist_now().strftime("%Y-%m")  # use IST timezone
-
-        # Build UpdateExpression dynamically
-        update_expr = "SET "
-        expr_attr_names = {}
-        expr_attr_values = {}
-        updates = []
+            month = ist_month()  # use IST timezone
 
-        # Initialize interactions map if it doesn't exist
         if not event_increments:
+            if unique_users_increment:
+                return self.increment_unique_users(tenant_id, month, by=unique_users_increment)
             return {"ok": True}
 
-        # Prepare the update expression for each event type
-        for i, (event_type, value) in enumerate(event_increments.items()):
-            event_alias = f"#e{i}"
-            value_alias = f":v{i}"
-            
-            expr_attr_names[event_alias] = event_type
-            expr_attr_values[value_alias] = {"N": str(value)}
-            
-            # Use if_not_exists to handle new attributes
-            updates.append(f"interactions.{event_alias} = if_not_exists(interactions.{event_alias}, :zero) + {value_alias}")
-
-        # Add zero value for if_not_exists
-        expr_attr_values[":zero"] = {"N": "0"}
-        
-        # If no updates, return early
-        if not updates:
-            return {"ok": True}
-            
-        update_expr += ", ".join(updates)
+        update_expr, expr_attr_names, expr_attr_values = _build_update_params(event_increments)
+        seed_expr = "SET interactions = :m"
+        seed_values = {":m": {"M": {k: {"N": str(v)} for k, v in event_increments.items()}}}
+        if unique_users_increment:
+            unique_users_value = {"N": str(unique_users_increment)}
+            update_expr += ", unique_users :u"
+            expr_attr_values = {**expr_attr_values, ":u": unique_users_value}
+            seed_expr += " ADD unique_users :u"
+            seed_values[":u"] = unique_users_value
+        key = _pk_key(tenant_id, month)
 
-        try:
+        def add():
             response = self.dynamodb.update_item(
                 TableName=self.table_name,
-                Key={
-                    "tenant_id": {"S": str(tenant_id)},
-                    "month": {"S": str(month)}
-                },
+                Key=key,
                 UpdateExpression=update_expr,
                 ExpressionAttributeNames=expr_attr_names,
                 ExpressionAttributeValues=expr_attr_values,
-                ReturnValues="UPDATED_NEW"
+                # the updated counters are only sent back when the caller asks for them
+                ReturnValues="UPDATED_NEW" if return_updated else "NONE"
             )
-            return response.get("Attributes", {})
-            
-        except self.dynamodb.exceptions.ConditionalCheckFailedException:
-            # Item doesn't exist, create it with initial values
+            return response.get("Attributes", {}) if return_updated else {"ok": True}
+
+        try:
+            try:
+                return add()
+            except ClientError as e:
+                if not _is_missing_interactions_map(e):
+                    raise
+
+            # First events of the month: seed the map with these increments (keeps unique_users intact)
             try:
-                initial_interactions = {k: {"N": str(v)} for k, v in event_increments.items()}
-                
-                response = self.dynamodb.put_item(
+                self.dynamodb.update_item(
                     TableName=self.table_name,
-                    Item={
-                        "tenant_id": {"S": str(tenant_id)},
-                        "month": {"S": str(month)},
-                        "interactions": {"M": initial_interactions}
-                    },
-                    ReturnValues="NONE"
+                    Key=key,
+                    UpdateExpression=seed_expr,
+                    ConditionExpression="attribute_not_exists(interactions)",
+                    ExpressionAttributeValues=seed_values,
                 )
                 return {"ok": True, "created": True}
-                
-            except Exception as e:
-                logging.error(f"Failed to create new item: {e}")
-                return {"ok": False, "error": str(e)}
-                
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+
+            # Another writer created the map in between; the ADD now succeeds
+            return add()
+
         except Exception as e:
             logging.error(f"Failed to update interactions: {e}")
             return {"ok": False, "error": str(e)}
+        finally:
+            self.invalidate(tenant_id, month)
+
+    def buffer(self) -> PendingIncrements:
+        """
+        usage
+        with repo.buffer() as buf:
+            buf.add("tenant123", "view")
+            buf.add("tenant123", "view")
+            buf.add("tenant456", "purchase", 2)
+        # one write for all of the above on exit
+        """
+        return PendingIncrements(self)
+
+    def buffer_interactions(self, tenant_id: str, event_increments: dict, month: str = None):
+        """
+        Accumulate increments in memory instead of writing them immediately.
+        Increments for the same (tenant, month) are merged and written by flush() as a
+        single update_item; flush runs automatically once FLUSH_THRESHOLD events are
+        pending, and at interpreter exit.
+        """
+        if not event_increments:
+            return
+        if month is None:
+            month = ist_month()
+
+        with self._buffer_lock:
+            self._buffer[(tenant_id, month)].update(event_increments)
+            self._pending += sum(event_increments.values())
+            pending = self._pending
+            # registered under the lock, so a concurrent flush cannot unregister a non-empty buffer
+            _buffered_repositories.add(self)
+        if pending >= self.FLUSH_THRESHOLD:
+            self.flush()
+
+    def flush(self):
+        """
+        Write all buffered increments in as few calls as possible (see update_interactions_bulk).
+        Chunks are written inline: flush also runs at interpreter exit, when no new pool threads can start.
+        """
+        with self._buffer_lock:
+            pending, self._buffer = self._buffer, defaultdict(Counter)
+            self._pending = 0
+            # the swapped-in buffer is empty until the lock is released
+            _buffered_repositories.discard(self)
+
+        if pending:
+            self.update_interactions_bulk(
+                ((tenant_id, month, counter) for (tenant_id, month), counter in pending.items()), concurrent=False
+            )
+
+    def update_interactions_bulk(self, updates: Iterable[Tuple[str, Optional[str], dict]],
+                                 concurrent: bool = True) -> dict:
+        """
+        Apply many (tenant_id, month, event_increments) updates with TransactWriteItems,
+        up to TRANSACT_MAX_ITEMS records per call and the calls issued concurrently (unless concurrent=False).
+        Updates for the same (tenant, month) are merged first, as a transaction may touch an item only once.
+        A chunk whose transaction is cancelled (e.g. a record without an interactions map yet)
+        is retried record by record through update_interactions.
+        """
+        merged: defaultdict[Tuple[str, str], Counter] = defaultdict(Counter)
+        for tenant_id, month, event_increments in updates:
+            if event_increments:
+                merged[(tenant_id, month or ist_month())].update(event_increments)
+
+        records = list(merged.items())
+        if len(records) == 1:
+            (tenant_id, month), counter = records[0]
+            result = self.update_interactions(tenant_id, dict(counter), month)
+            return {"ok": result.get("ok", True), "records": 1}
+
+        chunks = [records[i:i + self.TRANSACT_MAX_ITEMS] for i in range(0, len(records), self.TRANSACT_MAX_ITEMS)]
+        failed = self._write_chunks(self._transact_interactions, chunks, concurrent)
+        return {"ok": failed == 0, "records": len(records), "failed": failed}
+
+    def _write_chunks(self, write, chunks: list, concurrent: bool = True) -> int:
+        """Run write(chunk) for every chunk, on a pool when there is more than one; returns the summed failures."""
+        if not concurrent or len(chunks) <= 1:
+            return sum(write(chunk) for chunk in chunks)
+        with ThreadPoolExecutor(max_workers=min(self.BULK_MAX_WORKERS, len(chunks))) as pool:
+            futures = [run_in_executor_with_ctx(pool, write, chunk) for chunk in chunks]
+            return sum(future.result() for future in futures)
+
+    def _transact_interactions(self, records: List[Tuple[Tuple[str, str], Counter]]) -> int:
+        """Write one chunk in a single transaction; returns the number of records that failed."""
+        transact_items = []
+        for (tenant_id, month), counter in records:
+            update_expr, expr_attr_names, expr_attr_values = _build_update_params(counter)
+            transact_items.append({"Update": {
+                "TableName": self.table_name,
+                "Key": _pk_key(tenant_id, month),
+                "UpdateExpression": update_expr,
+                "ExpressionAttributeNames": expr_attr_names,
+                "ExpressionAttributeValues": expr_attr_values,
+            }})
+
+        # ADD is not idempotent: the token lets DynamoDB drop a retry of a transaction that already committed
+        token = str(uuid.uuid4())
+        try:
+            self.dynamodb.transact_write_items(TransactItems=transact_items, ClientRequestToken=token)
+            return 0
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "TransactionCanceledException":
+                logging.error(f"Failed to bulk update interactions: {e}")
+                return len(records)
+        finally:
+            for (tenant_id, month), _ in records:
+                self.invalidate(tenant_id, month)
+
+        failed = 0
+        for (tenant_id, month), counter in records:
+            if self.update_interactions(tenant_id, dict(counter), month).get("ok") is False:
+                failed += 1
+        return failed
+
+    def increment_unique_users(self, tenant_id: str, month: str = None, by: int = 1):
+        """
+        Atomically add `by` to the unique_users counter of the (tenant, month) record.
+        """
+        if month is None:
+            month = ist_month()
+
+        try:
+            self.dynamodb.update_item(
+                TableName=self.table_name,
+                Key=_pk_key(tenant_id, month),
+                UpdateExpression="ADD unique_users :by",
+                ExpressionAttributeValues={":by": {"N": str(by)}},
+            )
+            return {"ok": True}
+        except Exception as e:
+            logging.error(f"Failed to increment unique users: {e}")
+            return {"ok": False, "error": str(e)}
+        finally:
+            self.invalidate(tenant_id, month)
+
+    def increment_unique_users_bulk(self, updates: Iterable[Tuple[str, Optional[str], int]]) -> dict:
+        """
+        Apply many (tenant_id, month, by) unique-user increments with TransactWriteItems,
+        merged per (tenant, month) and chunked like update_interactions_bulk.
+        ADD on the top-level counter creates missing records, so no fallback is needed.
+        """
+        merged: Counter = Counter()
+        for tenant_id, month, by in updates:
+            merged[(tenant_id, month or ist_month())] += by
+
+        records = [(key, by) for key, by in merged.items() if by]
+        chunks = [records[i:i + self.TRANSACT_MAX_ITEMS] for i in range(0, len(records), self.TRANSACT_MAX_ITEMS)]
+
+        def write(chunk) -> int:
+            token = str(uuid.uuid4())
+            try:
+                self.dynamodb.transact_write_items(ClientRequestToken=token, TransactItems=[{"Update": {
+                    "TableName": self.table_name,
+                    "Key": _pk_key(tenant_id, month),
+                    "UpdateExpression": "ADD unique_users :by",
+                    "ExpressionAttributeValues": {":by": {"N": str(by)}},
+                }} for (tenant_id, month), by in chunk])
+                return 0
+            except Exception as e:
+                logging.error(f"Failed to bulk increment unique users: {e}")
+                return len(chunk)
+            finally:
+                for tenant_id, month in (key for key, _ in chunk):
+                    self.invalidate(tenant_id, month)
+
+        failed = self._write_chunks(write, chunks)
+        return {"ok": failed == 0, "records": len(records), "failed": failed}
 
     def get_interactions(self, tenant_id: str, month: str = None) -> InteractionTrackingEntity:
         """
         Retrieve interaction record as a Pydantic entity.
+        Results are memoized for CACHE_TTL_SECONDS per (tenant, month).
         """
         if month is None:
-            month = ist_now().strftime("%Y-%m")
+            month = ist_month()
+
+        cached = self.cache.get((tenant_id, month))
+        if cached is not MISSING:
+            return cached
 
         response = self.dynamodb.get_item(
             TableName=self.table_name,
-            Key={
-                "tenant_id": {"S": tenant_id},
-                "month": {"S": month}
-            }
+            Key=_pk_key(tenant_id, month)
         )
-        item = response.get("Item")
-        if not item or "interactions" not in item:
-            return InteractionTrackingEntity(tenant_id=tenant_id, month=month)
+        item = response.get("Item", {})
+        interactions_attr = item.get("interactions")
+        unique_users_attr = item.get("unique_users")
 
         # Convert DynamoDB map to simple dict
-        interactions = {k: int(v["N"]) for k, v in item["interactions"]["M"].items()}
+        interactions = {k: int(v["N"]) for k, v in interactions_attr["M"].items()} if interactions_attr else {}
 
-        return InteractionTrackingEntity(
+        # values were just converted from the trusted DB item, so skip pydantic re-validation
+        entity = InteractionTrackingEntity.model_construct(
             tenant_id=tenant_id,
             month=month,
-            interactions=interactions
+            interactions=interactions,
+            unique_users=int(unique_users_attr["N"]) if unique_users_attr else 0
         )
+        self.cache.set((tenant_id, month), entity)
+        return entity
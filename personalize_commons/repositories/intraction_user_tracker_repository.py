@@ -1,7 +1,8 @@
-import os
 import time
-from personalize_commons.utils.datetime_utils import ist_now
+from personalize_commons.utils.datetime_utils import ist_month
+from personalize_commons.utils.ttl_cache import MISSING, TTLCache
 from personalize_commons.entity.intraction_user_tracker_entity import IntractionUserTrackerEntity
+from personalize_commons.dependencies.aws_providers import get_env
 
 
 class InteractionUserTrackerRepository:
@@ -12,36 +13,62 @@ class InteractionUserTrackerRepository:
       - SK: user_id (S)
       - TTL: expire_at (N)     -> optional (enable TTL in table settings)
     """
+    # how many recently seen (tenant_month, user_id) pairs are remembered in-process, and for how long
+    SEEN_CACHE_SIZE = 100_000
+    SEEN_CACHE_TTL_SECONDS = 3600
 
     def __init__(self, client):
         self.dynamodb = client
-        self.table_name = os.getenv("INTERACTION_USER_TRACKER_TABLE", "interaction_user_tracker")
-        self.ttl_days = int(os.getenv("INTRACTION_USER_TRACKER_TTL_DAYS", "730"))  # default ~24 months
+        self.table_name = get_env("INTERACTION_USER_TRACKER_TABLE", "interaction_user_tracker")
+        self.ttl_days = int(get_env("INTRACTION_USER_TRACKER_TTL_DAYS", "730"))  # default ~24 months
+        # users known to have a record already, see mark_user_seen_once()
+        self.seen = TTLCache(maxsize=self.SEEN_CACHE_SIZE, ttl=self.SEEN_CACHE_TTL_SECONDS)
+        # (epoch minute, expire_at attribute) of the last _expire_at_attr() call
+        self._expire_at_cache: tuple[int, dict] = (-1, {})
 
     def _compute_ttl_epoch(self) -> int:
         """Compute TTL expiry as epoch seconds from now."""
         now_epoch = int(time.time())
         return now_epoch + self.ttl_days * 86400
 
+    def _expire_at_attr(self) -> dict:
+        """
+        expire_at attribute for records written now, rebuilt once per minute
+        (TTL is measured in days, so minute precision is plenty); shared, must not be mutated.
+        """
+        minute = int(time.time()) // 60
+        cached_minute, attr = self._expire_at_cache
+        if minute != cached_minute:
+            attr = {"N": str(minute * 60 + self.ttl_days * 86400)}
+            self._expire_at_cache = (minute, attr)
+        return attr
+
     def mark_user_seen_once(self, entity: IntractionUserTrackerEntity) -> bool:
         """
         Try to insert a (tenant_id, month, user_id) record.
         Returns:
           True  -> if user is new for this month
           False -> if user already exists (no new insert)
+        Repeat users seen recently by this process are answered from memory without a DynamoDB call.
         """
+        seen_key = (entity.tenant_month, entity.user_id)
+        if self.seen.get(seen_key) is not MISSING:
+            return False
+
         try:
             self.dynamodb.put_item(
                 TableName=self.table_name,
                 Item={
                     "tenant_month": {"S": entity.tenant_month},
                     "user_id": {"S": entity.user_id},
-                    "expire_at": {"N": str(entity.expire_at or self._compute_ttl_epoch())},
+                    "expire_at": {"N": str(entity.expire_at)} if entity.expire_at else self._expire_at_attr(),
                 },
                 ConditionExpression="attribute_not_exists(user_id)",
             )
+            self.seen.set(seen_key, True)
             return True
         except self.dynamodb.exceptions.ConditionalCheckFailedException:
+            self.seen.set(seen_key, True)
             return False
 
     def get_user(self, tenant_id: str, user_id: str, month: str = None) -> IntractionUserTrackerEntity | None:
@@ -50,7 +77,7 @@ class InteractionUserTrackerRepository:
         Returns Pydantic entity or None if not found.
         """
         if month is None:
-            month = ist_now().strftime("%Y-%m")
+            month = ist_month()
 
         tenant_month = f"{tenant_id}#{month}"
         response = self.dynamodb.get_item(
@@ -61,9 +88,10 @@ class InteractionUserTrackerRepository:
         if not item:
             return None
 
+        expire_at = item.get("expire_at")
         return IntractionUserTrackerEntity(
             tenant_id=tenant_id,
             month=month,
             user_id=user_id,
-            expire_at=int(item.get("expire_at", {}).get("N", "0")) if "expire_at" in item else None,
+            expire_at=int(expire_at["N"]) if expire_at else None,
         )
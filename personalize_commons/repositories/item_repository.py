@@ -1,21 +1,41 @@
-import os
-from typing import Dict, Optional
+from typing import Dict, Iterator, List, Optional
 
 from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeSerializer
 from botocore.exceptions import ClientError
 
 from personalize_commons.constants.app_constants import AppConstants
+from personalize_commons.utils.ttl_cache import MISSING, TTLCache
+from personalize_commons.dependencies.aws_providers import get_env, get_table
+from personalize_commons.utils.dynamodb_batch import batch_put_items
+from personalize_commons.utils.dynamodb_expressions import build_projection
+from personalize_commons.utils.dynamodb_pagination import paginate
+
+serializer = TypeSerializer()
 
 
 class ItemRepository:
-    def __init__(self, resource):
+    # get_item results are reused for this many seconds (writes through this repository evict them)
+    CACHE_TTL_SECONDS = 60
+
+    def __init__(self, resource, read_resource=None):
         self.resource = resource
-        self.table_name = os.getenv('DYNAMODB_TABLE_ITEMS', 'Items')
-        self.table = self.resource.Table(self.table_name)
+        # get_item lookups may be served by read_resource (e.g. DAX); queries and writes always use resource
+        self.read_resource = read_resource if read_resource is not None else resource
+        self.table_name = get_env('DYNAMODB_TABLE_ITEMS', 'Items')
+        self.table = get_table(self.resource, self.table_name)
+        self.read_table = get_table(self.read_resource, self.table_name)
+        # (tenant_id, product_id) -> item dict (or None when not found); cached items must not be mutated
+        self.cache = TTLCache(maxsize=10_000, ttl=self.CACHE_TTL_SECONDS)
+
+    def invalidate(self, tenant_id: str, product_id: str) -> None:
+        """Evict the cached get_item result for (tenant, product)."""
+        self.cache.pop((tenant_id, product_id))
 
     def get_item(self, tenant_id: str, product_id: str) -> Optional[Dict]:
         """
-        Retrieve an item by tenant_id and product_id
+        Retrieve an item by tenant_id and product_id.
+        Results (including misses) are memoized for CACHE_TTL_SECONDS.
 
         Args:
             tenant_id (str): The tenant identifier (partition key)
@@ -27,14 +47,20 @@ class ItemRepository:
         Raises:
             DynamoDBError: If there's an error accessing DynamoDB
         """
+        cached = self.cache.get((tenant_id, product_id))
+        if cached is not MISSING:
+            return cached
+
         try:
-            response = self.table.get_item(
+            response = self.read_table.get_item(
                 Key={
                     AppConstants.TENANT_ID: tenant_id,
                     AppConstants.ITEM_ID: product_id
                 }
             )
-            return response.get('Item')
+            item = response.get('Item')
+            self.cache.set((tenant_id, product_id), item)
+            return item
         except ClientError as e:
             raise e
 
@@ -60,10 +86,14 @@ class ItemRepository:
             return item
         except ClientError as e:
             raise e
+        finally:
+            self.invalidate(item.get(AppConstants.TENANT_ID), item.get(AppConstants.ITEM_ID))
 
     def batch_add_items(self, items: list) -> None:
         """
-        Add multiple items in a batch
+        Add multiple items in a batch.
+        Items are written with batch_put_items: 25-item BatchWriteItem calls issued concurrently,
+        UnprocessedItems retried with jittered exponential backoff.
 
         Args:
             items (list): List of items to add
@@ -71,21 +101,24 @@ class ItemRepository:
         Raises:
             DynamoDBError: If there's an error accessing DynamoDB
         """
+        # Skip invalid items
+        items = [item for item in items if all(k in item for k in (AppConstants.TENANT_ID, AppConstants.ITEM_ID))]
         try:
-            with self.table.batch_writer() as batch:
-                for item in items:
-                    if not all(k in item for k in (AppConstants.TENANT_ID, AppConstants.ITEM_ID)):
-                        continue  # Skip invalid items
-                    batch.put_item(Item=item)
+            batch_put_items(self.resource.meta.client, self.table_name,
+                            [{k: serializer.serialize(v) for k, v in item.items()} for item in items])
         except ClientError as e:
             raise e
+        finally:
+            for item in items:
+                self.invalidate(item[AppConstants.TENANT_ID], item[AppConstants.ITEM_ID])
 
-    def query_items_by_tenant(self, tenant_id: str) -> list:
+    def query_items_by_tenant(self, tenant_id: str, projection: Optional[List[str]] = None) -> list:
         """
         Query all items for a specific tenant
 
         Args:
             tenant_id (str): The tenant identifier
+            projection (list): Optional attribute names to fetch instead of whole items
 
         Returns:
             list: List of items for the tenant
@@ -93,10 +126,26 @@ class ItemRepository:
         Raises:
             DynamoDBError: If there's an error accessing DynamoDB
         """
+        return list(self.iter_items_by_tenant(tenant_id, projection))
+
+    def iter_items_by_tenant(self, tenant_id: str, projection: Optional[List[str]] = None) -> Iterator[Dict]:
+        """
+        Lazily yield every item of a tenant, following LastEvaluatedKey page by page
+        (a single query returns at most 1 MB).
+
+        Args:
+            tenant_id (str): The tenant identifier
+            projection (list): Optional attribute names to fetch instead of whole items
+
+        Raises:
+            DynamoDBError: If there's an error accessing DynamoDB
+        """
+        query_params = {'KeyConditionExpression': Key('tenant_id').eq(tenant_id)}
+        if projection:
+            query_params['ProjectionExpression'], query_params['ExpressionAttributeNames'] = build_projection(projection)
+
         try:
-            response = self.table.query(
-                KeyConditionExpression=Key('tenant_id').eq(tenant_id)
-            )
-            return response.get('Items', [])
+            for response in paginate(self.table.query, **query_params):
+                yield from response.get('Items', [])
         except ClientError as e:
             raise e
@@ -1,26 +1,48 @@
 import logging
-import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple, Iterable, Iterator, List
 
 from botocore.exceptions import ClientError
 
 from personalize_commons.constants.app_constants import AppConstants
+from personalize_commons.constants.context import run_in_executor_with_ctx
 from personalize_commons.constants.db_constants import DBConstants
-from personalize_commons.entity.recommendation_entity import RecommendationEntity
-from personalize_commons.utils.datetime_utils import ist_now_iso
+from personalize_commons.entity.recommendation_entity import RecommendationEntity, RecommendationStatus
+from personalize_commons.dependencies.aws_providers import get_env, get_table
+from personalize_commons.utils.dynamodb_expressions import build_projection, conditional_update
+from personalize_commons.utils.dynamodb_batch import batch_get_items
 
 logger = logging.getLogger(__name__)
 
 
+# entity fields update_recommendation may write: keys are immutable and updated_at is always set by the repository
+_UPDATABLE_FIELDS = frozenset(RecommendationEntity.model_fields) - {
+    AppConstants.TENANT_ID, 'recommendation_id', DBConstants.UPDATED_AT
+}
+
+
+def _tenant_status(tenant_id: str, status: str) -> str:
+    # f-strings format a str Enum member as 'RecommendationStatus.X' on Python 3.12+, so use its value
+    return f'{tenant_id}#{RecommendationStatus(status).value}'
+
+
 class RecommendationRepository:
     """Repository class for handling RecommendationEntity CRUD operations with DynamoDB."""
 
-    def __init__(self, resource):
-        """Initialize the repository with DynamoDB connection."""
+    def __init__(self, resource, read_resource=None):
+        """
+        Initialize the repository with DynamoDB connection.
+        read_resource (e.g. DAX) serves only the GetItem/BatchGetItem lookups; queries and writes always use
+        resource, as the DAX query cache is not invalidated by writes.
+        """
         self.resource = resource
-        self.table_name = os.getenv('DYNAMODB_TABLE_RECOMMENDATIONS', 'recommendations')
-        self.table = self.resource.Table(self.table_name)
+        self.read_resource = read_resource if read_resource is not None else resource
+        self.table_name = get_env('DYNAMODB_TABLE_RECOMMENDATIONS', 'recommendations')
+        self.table = get_table(self.resource, self.table_name)
+        self.read_table = get_table(self.read_resource, self.table_name)
+        # status + date range queries use STATUS_CREATED_AT_INDEX once the GSI exists and is backfilled
+        self.use_status_created_at_index = get_env('DYNAMODB_RECOMMENDATIONS_STATUS_CREATED_AT_INDEX') == 'true'
 
     def create_recommendation(self, recommendation: RecommendationEntity) -> RecommendationEntity:
         """
@@ -40,22 +62,21 @@ class RecommendationRepository:
             if not recommendation.tenant_id or not recommendation.recommendation_id:
                 raise ValueError("tenant_id and recommendation_id are required")
 
-            # Ensure we're not overwriting existing record
-            existing = self.get_recommendation(
-                tenant_id=recommendation.tenant_id,
-                recommendation_id=recommendation.recommendation_id
-            )
-            if existing:
-                raise ValueError(f"Recommendation with ID {recommendation.recommendation_id} already exists")
-
-            # Convert to DynamoDB item and save
+            # Convert to DynamoDB item and save; the condition keeps an existing record from being overwritten
             item = recommendation.to_dynamodb_item()
-            self.table.put_item(Item=item)
+            item[DBConstants.TENANT_STATUS] = _tenant_status(recommendation.tenant_id, recommendation.status)
+            self.table.put_item(
+                Item=item,
+                ConditionExpression='attribute_not_exists(tenant_id) AND attribute_not_exists(recommendation_id)'
+            )
             logger.info(
                 f"Created recommendation {recommendation.recommendation_id} for tenant {recommendation.tenant_id}")
             return recommendation
 
         except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                raise ValueError(
+                    f"Recommendation with ID {recommendation.recommendation_id} already exists") from e
             error_msg = f"DynamoDB error creating recommendation: {e.response['Error']['Message']}"
             logger.error(error_msg, exc_info=True)
             raise Exception(error_msg) from e
@@ -80,67 +101,24 @@ class RecommendationRepository:
             Exception: For DynamoDB errors
             :param tenant_id:
         """
-        try:
-            # First get the existing recommendation to merge with updates
-            existing = self.get_recommendation(
-                tenant_id=tenant_id,
-                recommendation_id=recommendation_id
-            )
-            if not existing:
-                return None
-
-            # Convert entity to dict, update with new values, and back to entity
-            update_dict = existing.model_dump()
-
-            # Remove updated_at from update_data if it exists to prevent duplicate
-            update_data.pop('updated_at', None)
-
-            # Update with new values
-            update_dict.update({
-                k: v for k, v in update_data.items()
-                if v is not None and k in update_dict
-            })
-
-            # Ensure tenant_id remains unchanged
-            if AppConstants.TENANT_ID in update_dict and update_dict[AppConstants.TENANT_ID] != tenant_id:
-                raise ValueError("Cannot change tenant_id of a recommendation")
-
-            # Always set updated_at to current time
-            update_dict['updated_at'] = ist_now_iso()
-
-            # Convert back to entity to validate
-            updated_entity = RecommendationEntity(**update_dict)
-
-            # Prepare update expression
-            update_expression = 'SET ' + ', '.join(
-                f'#{k} = :{k}' for k in update_dict.keys() if k != 'tenant_id' and k != 'recommendation_id')
-            expression_attribute_names = {f'#{k}': k for k in update_dict.keys() if
-                                          k != 'tenant_id' and k != 'recommendation_id'}
-
-            # Convert any datetime objects to ISO format strings
-            expression_attribute_values = {}
-            for k, v in update_dict.items():
-                if k == 'tenant_id' or k == 'recommendation_id':
-                    continue
-                if isinstance(v, datetime):
-                    expression_attribute_values[f':{k}'] = v.isoformat()
-                else:
-                    expression_attribute_values[f':{k}'] = v
-
-            # Execute update
-            self.table.update_item(
-                Key={
-                    'tenant_id': tenant_id,
-                    'recommendation_id': recommendation_id
-                },
-                UpdateExpression=update_expression,
-                ExpressionAttributeNames=expression_attribute_names,
-                ExpressionAttributeValues=expression_attribute_values,
-                ReturnValues='ALL_NEW'
-            )
+        # Ensure tenant_id remains unchanged
+        if update_data.get(AppConstants.TENANT_ID, tenant_id) != tenant_id:
+            raise ValueError("Cannot change tenant_id of a recommendation")
 
-            return updated_entity
+        # Only known, non-key fields with a value are written
+        update_data = {k: v for k, v in update_data.items() if k in _UPDATABLE_FIELDS and v is not None}
+        # keep the synthetic index key in step with the status
+        extra_fields = ({DBConstants.TENANT_STATUS: _tenant_status(tenant_id, update_data[DBConstants.STATUS])}
+                        if DBConstants.STATUS in update_data else None)
 
+        try:
+            return conditional_update(
+                self.table,
+                {AppConstants.TENANT_ID: tenant_id, 'recommendation_id': recommendation_id},
+                update_data,
+                RecommendationEntity,
+                extra_fields,
+            )
         except ClientError as e:
             error_msg = f"DynamoDB error updating recommendation: {e.response['Error']['Message']}"
             logger.error(error_msg, exc_info=True)
@@ -149,13 +127,15 @@ class RecommendationRepository:
             logger.error(f"Unexpected error updating recommendation: {str(e)}", exc_info=True)
             raise
 
-    def get_recommendation(self, tenant_id: str, recommendation_id: str) -> Optional[RecommendationEntity]:
+    def get_recommendation(self, tenant_id: str, recommendation_id: str,
+                           consistent_read: bool = False) -> Optional[RecommendationEntity]:
         """
         Get a recommendation by tenant_id and recommendation_id.
 
         Args:
             tenant_id: The tenant ID
             recommendation_id: The recommendation ID
+            consistent_read: Strongly consistent read; behind DAX this bypasses the item cache
 
         Returns:
             The recommendation entity if found, None otherwise
@@ -167,11 +147,12 @@ class RecommendationRepository:
             if not tenant_id or not recommendation_id:
                 raise ValueError("Both tenant_id and recommendation_id are required")
 
-            response = self.table.get_item(
+            response = self.read_table.get_item(
                 Key={
                     'tenant_id': tenant_id,
                     'recommendation_id': recommendation_id
-                }
+                },
+                ConsistentRead=consistent_read
             )
 
             item = response.get('Item')
@@ -190,6 +171,20 @@ class RecommendationRepository:
             logger.error(f"Unexpected error getting recommendation: {str(e)}", exc_info=True)
             raise
 
+    def batch_get_recommendations(self, keys: Iterable[Tuple[str, str]]) -> Iterator[RecommendationEntity]:
+        """
+        Fetch many recommendations in BatchGetItem calls instead of one GetItem per key.
+
+        Args:
+            keys: (tenant_id, recommendation_id) pairs
+
+        Yields:
+            The recommendation entities that exist, in no particular order
+        """
+        key_dicts = [{'tenant_id': t, 'recommendation_id': r} for t, r in keys]
+        for item in batch_get_items(self.read_resource, self.table_name, key_dicts):
+            yield RecommendationEntity.from_dynamodb_item(item)
+
     def get_recommendations(
             self,
             tenant_id: str,
@@ -198,7 +193,9 @@ class RecommendationRepository:
             end_date: datetime = None,
             page_size: int = 10,
             last_evaluated_key: dict = None,
-            sort_order: str = "desc"
+            sort_order: str = "desc",
+            projection: Optional[List[str]] = None,
+            raw: bool = False
     ) -> Dict[str, Any]:
         """
         Get recommendations by status and/or date range using appropriate LSI.
@@ -212,63 +209,22 @@ class RecommendationRepository:
             page_size: Number of items per page
             last_evaluated_key: Pagination token from previous query
             sort_order: Sort order ('asc' or 'desc')
+            projection: Optional attribute names to fetch (e.g. for listings); items are then
+                returned as raw dicts instead of RecommendationEntity, since they are partial.
+                Attributes projected into the LSI are served without a fetch from the base table.
+            raw: Return the items as the plain dicts boto3 produced, skipping entity validation
+                (e.g. when they are only serialized back out as JSON; numbers are Decimal)
 
         Returns:
             Dictionary containing items and pagination info
         """
         try:
-            # Base key condition
-            key_condition = 'tenant_id = :tenant_id'
-            expr_attr_values = {':tenant_id': tenant_id}
-            expr_attr_names = {}
-            filter_expression = []
-
-            # Determine which index to use based on parameters
-            index_name = None
-            # This will exclude all records from July 15, unless they were created exactly at midnight (00:00:00) — which is very unlikely.
-            if end_date is not None:
-                end_date = end_date + timedelta(days=1)
-
-            # If status is provided but no date range, use StatusIndex
-            if status and not (start_date or end_date):
-                index_name = DBConstants.STAUS_AT_INDEX
-                key_condition += ' AND #status = :status'
-                expr_attr_names['#status'] = 'status'
-                expr_attr_values[':status'] = status
-
-
-
-            # Otherwise, use CreatedAtIndex (default)
-            else:
-                index_name = DBConstants.CREATED_AT_INDEX
-                # Add date range to key condition if provided
-                if start_date and end_date:
-                    key_condition += ' AND #created_at BETWEEN :start_date AND :end_date'
-                    expr_attr_names['#created_at'] = 'created_at'
-                    expr_attr_values[':start_date'] = start_date.isoformat()
-                    expr_attr_values[':end_date'] = end_date.isoformat()
-
-                # Add status as filter if provided
-                if status:
-                    filter_expression.append('#status = :status')
-                    expr_attr_names['#status'] = 'status'
-                    expr_attr_values[':status'] = status
-
-            # Build query parameters
-            query_params = {
-                'IndexName': index_name,
-                'KeyConditionExpression': key_condition,
-                'ExpressionAttributeValues': expr_attr_values,
-                'Limit': page_size,
-                'ScanIndexForward': sort_order.lower() == 'asc'
-            }
-
-            if expr_attr_names:
-                query_params['ExpressionAttributeNames'] = expr_attr_names
-
-            # Add filter expression if we have any filters
-            if filter_expression:
-                query_params['FilterExpression'] = ' AND '.join(filter_expression)
+            query_params = self._build_recommendations_query(tenant_id, status, start_date, end_date, page_size,
+                                                             sort_order, self.use_status_created_at_index)
+            if projection:
+                projection_expression, projection_names = build_projection(projection)
+                query_params['ProjectionExpression'] = projection_expression
+                query_params.setdefault('ExpressionAttributeNames', {}).update(projection_names)
 
             if last_evaluated_key:
                 query_params['ExclusiveStartKey'] = last_evaluated_key
@@ -276,8 +232,10 @@ class RecommendationRepository:
             # Execute query
             response = self.table.query(**query_params)
 
-            # Convert items to entities
-            items = [RecommendationEntity.from_dynamodb_item(item) for item in response.get('Items', [])]
+            # Convert items to entities (projected items are partial, so they stay raw dicts)
+            items = response.get('Items', [])
+            if not (projection or raw):
+                items = RecommendationEntity.from_dynamodb_items(items)
 
             return {
                 'items': items,
@@ -288,3 +246,110 @@ class RecommendationRepository:
         except Exception as e:
             logger.error(f"Error getting recommendations: {str(e)}", exc_info=True)
             raise
+
+    def iter_recommendations(
+            self,
+            tenant_id: str,
+            status: str = None,
+            start_date: datetime = None,
+            end_date: datetime = None,
+            page_size: int = 100,
+            sort_order: str = "desc"
+    ) -> Iterator[RecommendationEntity]:
+        """
+        Lazily yield every matching recommendation; same filters as get_recommendations.
+        The next page is requested in the background as soon as the current one arrives,
+        so DynamoDB's round trip overlaps with the caller consuming the current page.
+        The prefetch runs in the caller's context, so tenant_id_ctx is visible in the worker.
+        """
+        query_params = self._build_recommendations_query(tenant_id, status, start_date, end_date, page_size,
+                                                         sort_order, self.use_status_created_at_index)
+        pool = ThreadPoolExecutor(max_workers=1)
+        try:
+            future = run_in_executor_with_ctx(pool, self.table.query, **query_params)
+            while future is not None:
+                response = future.result()
+                last_key = response.get('LastEvaluatedKey')
+                future = None
+                if last_key:
+                    query_params['ExclusiveStartKey'] = last_key
+                    future = run_in_executor_with_ctx(pool, self.table.query, **query_params)
+                yield from RecommendationEntity.from_dynamodb_items(response.get('Items', []))
+        finally:
+            # an abandoned iterator does not wait for its in-flight page
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _build_recommendations_query(
+            tenant_id: str,
+            status: Optional[str],
+            start_date: Optional[datetime],
+            end_date: Optional[datetime],
+            page_size: int,
+            sort_order: str,
+            use_status_created_at_index: bool = False
+    ) -> Dict[str, Any]:
+        # Base key condition
+        key_condition = 'tenant_id = :tenant_id'
+        expr_attr_values = {':tenant_id': tenant_id}
+        expr_attr_names = {}
+        filter_expression = []
+
+        # Determine which index to use based on parameters
+        index_name = None
+        # This will exclude all records from July 15, unless they were created exactly at midnight (00:00:00) — which is very unlikely.
+        if end_date is not None:
+            end_date = end_date + timedelta(days=1)
+
+        # If status is provided but no date range, use StatusIndex
+        if status and not (start_date or end_date):
+            index_name = DBConstants.STAUS_AT_INDEX
+            key_condition += ' AND #status = :status'
+            expr_attr_names['#status'] = 'status'
+            expr_attr_values[':status'] = status
+
+        # Status and date range: the composite GSI reads only matching items instead of filtering the range
+        elif status and start_date and end_date and use_status_created_at_index:
+            index_name = DBConstants.STATUS_CREATED_AT_INDEX
+            key_condition = '#tenant_status = :tenant_status AND #created_at BETWEEN :start_date AND :end_date'
+            expr_attr_names['#tenant_status'] = DBConstants.TENANT_STATUS
+            expr_attr_names['#created_at'] = 'created_at'
+            expr_attr_values = {
+                ':tenant_status': _tenant_status(tenant_id, status),
+                ':start_date': start_date.isoformat(),
+                ':end_date': end_date.isoformat(),
+            }
+
+        # Otherwise, use CreatedAtIndex (default)
+        else:
+            index_name = DBConstants.CREATED_AT_INDEX
+            # Add date range to key condition if provided
+            if start_date and end_date:
+                key_condition += ' AND #created_at BETWEEN :start_date AND :end_date'
+                expr_attr_names['#created_at'] = 'created_at'
+                expr_attr_values[':start_date'] = start_date.isoformat()
+                expr_attr_values[':end_date'] = end_date.isoformat()
+
+            # Add status as filter if provided
+            if status:
+                filter_expression.append('#status = :status')
+                expr_attr_names['#status'] = 'status'
+                expr_attr_values[':status'] = status
+
+        # Build query parameters
+        query_params = {
+            'IndexName': index_name,
+            'KeyConditionExpression': key_condition,
+            'ExpressionAttributeValues': expr_attr_values,
+            'Limit': page_size,
+            'ScanIndexForward': sort_order.lower() == 'asc'
+        }
+
+        if expr_attr_names:
+            query_params['ExpressionAttributeNames'] = expr_attr_names
+
+        # Add filter expression if we have any filters
+        if filter_expression:
+            query_params['FilterExpression'] = ' AND '.join(filter_expression)
+
+        return query_params
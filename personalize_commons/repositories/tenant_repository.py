@@ -1,20 +1,30 @@
-import os
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import chain
+from typing import List, Dict, Iterator
 import logging
 
 from boto3.dynamodb.conditions import Key
 
 from personalize_commons.constants.app_constants import AppConstants
+from personalize_commons.constants.context import run_in_executor_with_ctx
 from personalize_commons.constants.db_constants import DBConstants
+from personalize_commons.dependencies.aws_providers import get_env, get_table
+from personalize_commons.utils.dynamodb_expressions import build_set_expression
+from personalize_commons.utils.dynamodb_pagination import paginate
 
 logger = logging.getLogger(__name__)
 
+
 class TenantRepository:
+    # upper bound for get_all_tenants' parallel segments: one thread and one pooled connection each
+    # (the shared client's max_pool_connections is 50)
+    MAX_SCAN_SEGMENTS = 50
 
     def __init__(self,resource):
         self.resource = resource
-        self.table_name = os.getenv('DYNAMODB_TABLE_TENANTS', 'tenants')
-        self.table = self.resource.Table(self.table_name)
+        self.table_name = get_env('DYNAMODB_TABLE_TENANTS', 'tenants')
+        self.table = get_table(self.resource, self.table_name)
 
 
     def get_tenant(self, tenant_id: str) -> Dict[str, str]|None:
@@ -23,7 +33,9 @@ class TenantRepository:
                 KeyConditionExpression=AppConstants.TENANT_ID + f' = :{AppConstants.TENANT_ID}',
                 ExpressionAttributeValues={
                     f':{AppConstants.TENANT_ID }': tenant_id
-                }
+                },
+                # (tenant_id, email) is a composite key and only the first item is returned
+                Limit=1
             )
             data= response.get(AppConstants.DYNAMO_ITEMS,None)
             if data is None or  len(data) == 0:
@@ -33,12 +45,30 @@ class TenantRepository:
             raise e
 
 
-    def get_all_tenants(self) -> List[Dict]:
-        try:
-            response = self.table.scan()
-            return response.get('Items', [])
-        except Exception as e:
-            raise e
+    def get_all_tenants(self, total_segments: int = 8) -> List[Dict]:
+        """
+        Scan the whole tenants table as `total_segments` parallel segments (at most MAX_SCAN_SEGMENTS).
+        Every segment is paginated to the end, so tables over 1 MB are returned in full.
+        """
+        total_segments = max(1, min(total_segments, self.MAX_SCAN_SEGMENTS))
+        scan_segment = partial(self._scan_segment, total_segments=total_segments)
+        with ThreadPoolExecutor(max_workers=total_segments) as pool:
+            futures = [run_in_executor_with_ctx(pool, scan_segment, segment) for segment in range(total_segments)]
+            return list(chain.from_iterable(future.result() for future in futures))
+
+    def iter_all_tenants(self) -> Iterator[Dict]:
+        """
+        Lazily yield every tenant with a sequential paginated Scan.
+        Only one page is held in memory at a time; use get_all_tenants when the full list is needed.
+        """
+        for response in paginate(self.table.scan):
+            yield from response.get(AppConstants.DYNAMO_ITEMS, [])
+
+    def _scan_segment(self, segment: int, total_segments: int) -> List[Dict]:
+        items: List[Dict] = []
+        for response in paginate(self.table.scan, Segment=segment, TotalSegments=total_segments):
+            items.extend(response.get(AppConstants.DYNAMO_ITEMS, []))
+        return items
 
     def create_tenant(self, tenant:dict[str, str]) -> dict[str, str]:
         try:
@@ -66,23 +96,11 @@ class TenantRepository:
             Exception: If the update operation fails
         """
         try:
-            # Build the update expression
-            update_expression = 'SET '
-            expression_attribute_values = {}
-            expression_attribute_names = {}
-            
-            # Add each field from update_data to the update expression
-            for i, (key, value) in enumerate(update_data.items()):
-                if key != AppConstants.TENANT_ID:  # Prevent updating the tenant_id
-                    placeholder = f'#{key}'
-                    value_placeholder = f':val{i}'
-                    update_expression += f"{placeholder} = {value_placeholder}, "
-                    expression_attribute_names[placeholder] = key
-                    expression_attribute_values[value_placeholder] = value
-            
-            # Remove the trailing comma and space
-            update_expression = update_expression.rstrip(', ')
-            
+            # Expression templates are cached per field set; only the values are built per call
+            fields = tuple(k for k in update_data if k != AppConstants.TENANT_ID)  # Prevent updating the tenant_id
+            update_expression, expression_attribute_names, value_aliases = build_set_expression(fields)
+            expression_attribute_values = {alias: update_data[k] for alias, k in zip(value_aliases, fields)}
+
             response = self.table.update_item(
                 Key={AppConstants.TENANT_ID: tenant_id,AppConstants.EMAIL:email},
                 UpdateExpression=update_expression,
@@ -102,11 +120,12 @@ class TenantRepository:
     def get_by_email(self, email: str):
         """
         Query tenant data using email (via GSI).
-        Returns first match (or list if multi-tenant by email).
+        Returns the first match; only one item is read from the index.
         """
         response = self.table.query(
             IndexName=DBConstants.EMAIL_INDEX,  # GSI name
-            KeyConditionExpression=Key(AppConstants.EMAIL).eq(email)
+            KeyConditionExpression=Key(AppConstants.EMAIL).eq(email),
+            Limit=1
         )
 
         items = response.get("Items", [])
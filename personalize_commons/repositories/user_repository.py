@@ -1,16 +1,76 @@
 import logging
-import os
-from typing import Dict, List, Any, Optional
+from base64 import b64decode
+from decimal import Decimal
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple, Callable
 
-from boto3.dynamodb.conditions import Key
-from boto3.dynamodb.types import TypeDeserializer
+from boto3.dynamodb.types import Binary, TypeSerializer
 from botocore.exceptions import ClientError
 
 from personalize_commons.constants.app_constants import AppConstants
 from personalize_commons.model.user_model import QueryResponse
+from personalize_commons.dependencies.aws_providers import get_env, get_table
+from personalize_commons.utils.dynamodb_batch import batch_get_items, batch_put_items
+from personalize_commons.utils.dynamodb_pagination import paginate
 
 logger = logging.getLogger(__name__)
-deserializer = TypeDeserializer()
+serializer = TypeSerializer()
+
+
+def _deserialize(attribute: Dict[str, Any]) -> Any:
+    """Low-level attribute value -> Python value, same results as boto3's TypeDeserializer."""
+    (tag, value), = attribute.items()
+    return TAG_DESERIALIZE[tag](value)
+
+
+# one dict lookup per attribute instead of TypeDeserializer's per-call method dispatch
+TAG_DESERIALIZE = {
+    'S': str,
+    'N': Decimal,
+    'BOOL': bool,
+    'NULL': lambda value: None,
+    # the raw-parsing client (aws_providers.get_dynamodb_raw_client) leaves blobs base64-encoded
+    'B': lambda value: Binary(b64decode(value) if isinstance(value, str) else value),
+    'SS': set,
+    'NS': lambda values: {Decimal(v) for v in values},
+    'BS': lambda values: {TAG_DESERIALIZE['B'](v) for v in values},
+    'L': lambda values: [_deserialize(v) for v in values],
+    'M': lambda values: {k: _deserialize(v) for k, v in values.items()},
+}
+
+# static partition-key condition: no Condition object or boto3 expression building per query
+_TENANT_KEY_CONDITION = '#tenant_id = :tenant_id'
+_TENANT_KEY_NAMES = {'#tenant_id': AppConstants.TENANT_ID}
+
+# rule dtype -> PartiQL parameter builder; resolved once per rule, not once per IN-list value
+_DTYPE_CONVERTERS: Dict[str, Callable[[Any], Dict[str, Any]]] = {
+    'integer': lambda value: {'N': str(int(value))},
+    'int': lambda value: {'N': str(int(value))},
+    'float': lambda value: {'N': str(float(value))},
+    'double': lambda value: {'N': str(float(value))},
+    'string': lambda value: {'S': str(value)},
+    'bool': lambda value: {'BOOL': bool(value)},
+    'boolean': lambda value: {'BOOL': bool(value)},
+}
+
+
+def _dtype_converter(dtype: str) -> Callable[[Any], Dict[str, Any]]:
+    converter = _DTYPE_CONVERTERS.get(dtype.lower())
+    if converter is None:
+        raise ValueError(f"Unsupported dtype: {dtype}")
+    return converter
+
+
+# JSON rule operator -> PartiQL operator
+_PARTIQL_OPERATORS = {
+    "==": "=",
+    "!=": "<>",
+    ">=": ">=",
+    "<=": "<=",
+    ">": ">",
+    "<": "<",
+    "in": "IN",
+    "not in": "NOT IN"
+}
 
 
 class UserRepository:
@@ -18,8 +78,8 @@ class UserRepository:
     def __init__(self, client,resource):
         self.resource = resource
         self.dynamodb_client = client
-        self.table_name = os.getenv("DYNAMODB_TABLE_USERS")
-        self.table = self.resource.Table(self.table_name)
+        self.table_name = get_env("DYNAMODB_TABLE_USERS")
+        self.table = get_table(self.resource, self.table_name)
 
         self._initialized = True
         logger.info(f"Initialized UserRepository with table: {self.table_name}")
@@ -35,18 +95,13 @@ class UserRepository:
             if parameters:
                 request_params['Parameters'] = parameters
 
-            logger.debug(f"Executing PartiQL: {statement}")
-            logger.debug(f"With params: {parameters}")
-            print("Request params:", request_params)
-            print(statement)
+            # guarded so the messages are only formatted when DEBUG logging is on
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Executing PartiQL: {statement}")
+                logger.debug(f"With params: {parameters}")
             response = self.dynamodb_client.execute_statement(**request_params)
             # Deserialize the DynamoDB items to Python types
-            items = []
-            for item in response.get('Items', []):
-                deserialized = {k: deserializer.deserialize(v) for k, v in item.items()}
-                items.append(deserialized)
-
-            return items
+            return [{k: _deserialize(v) for k, v in item.items()} for item in response.get('Items', [])]
 
         except Exception as e:
             logger.error(f"Error executing PartiQL query: {str(e)}")
@@ -57,7 +112,7 @@ class UserRepository:
 
     def get_all_users_by_tenant(self, tenant_id: str) -> QueryResponse:
         """
-        Retrieve all users for a specific tenant using a PartiQL query.
+        Retrieve all users for a specific tenant with a native Query on the partition key.
 
         Args:
             tenant_id: The ID of the tenant to retrieve users for
@@ -66,50 +121,15 @@ class UserRepository:
             QueryResponse containing the list of users and count
         """
         try:
-            query = f"""
-                SELECT * FROM {self.table_name} 
-                WHERE tenant_id = ?
-            """
-            
-            # Convert tenant_id to DynamoDB type format
-            params = [self._convert_to_dynamodb_type(tenant_id)]
-            
             logger.info(f"Fetching all users for tenant: {tenant_id}")
-            items = self.execute_partiql(query, params)
-            
+            items = self.query_users_by_tenant(tenant_id)
+
             return QueryResponse(users=items, count=len(items))
-            
+
         except Exception as e:
             logger.error(f"Error retrieving users for tenant {tenant_id}: {str(e)}", exc_info=True)
             raise
 
-    def _convert_to_dynamodb_type(self, value: Any) -> Dict[str, Any]:
-        """Convert Python value to DynamoDB attribute value format"""
-        if value is None:
-            return {'NULL': True}
-        elif isinstance(value, bool):
-            return {'BOOL': value}
-        elif isinstance(value, (int, float)):
-            return {'N': str(value)}
-        elif isinstance(value, str):
-            return {'S': value}
-        elif isinstance(value, (list, tuple)):
-            if not value:
-                return {'L': []}
-            # Check if all elements are of the same type
-            first_type = type(value[0])
-            if all(isinstance(x, first_type) for x in value):
-                if first_type == str:
-                    return {'SS': list(value)}
-                elif first_type in (int, float):
-                    return {'NS': [str(x) for x in value]}
-            return {'L': [self._convert_to_dynamodb_type(x) for x in value]}
-        elif isinstance(value, dict):
-            return {'M': {k: self._convert_to_dynamodb_type(v) for k, v in value.items()}}
-        else:
-            return {'S': str(value)}
-
-
     def _convert_value_by_dtype(self,value: Any, dtype: str) -> Dict[str, Any]:
         """
         Convert a Python value to a DynamoDB PartiQL parameter based on dtype.
@@ -121,18 +141,7 @@ class UserRepository:
         Returns:
             Dict[str, Any]: DynamoDB PartiQL parameter dictionary.
         """
-        dtype = dtype.lower()
-
-        if dtype in ("integer", "int"):
-            return {'N': str(int(value))}
-        elif dtype in ("float", "double"):
-            return {'N': str(float(value))}
-        elif dtype == "string":
-            return {'S': str(value)}
-        elif dtype in ("bool", "boolean"):
-            return {'BOOL': bool(value)}
-        else:
-            raise ValueError(f"Unsupported dtype: {dtype}")
+        return _dtype_converter(dtype)(value)
 
     def add_user(self, item:dict[str,Any]) -> None:
         """Add a new user to the DynamoDB table."""
@@ -144,6 +153,33 @@ class UserRepository:
             logger.error(f"Failed to add user {item[AppConstants.USER_ID]}: {str(e)}")
             raise
 
+    def batch_get_users(self, keys: Iterable[Tuple[str, str]]) -> Iterator[Dict[str, Any]]:
+        """
+        Fetch many users in BatchGetItem calls instead of one request per user.
+
+        Args:
+            keys: (tenant_id, user_id) pairs
+
+        Yields:
+            The user items that exist, in no particular order
+        """
+        key_dicts = [{AppConstants.TENANT_ID: t, AppConstants.USER_ID: u} for t, u in keys]
+        yield from batch_get_items(self.resource, self.table_name, key_dicts)
+
+    def add_users(self, items: List[Dict[str, Any]]) -> None:
+        """
+        Add many users (in the same low-level format as add_user) with concurrent 25-item BatchWriteItem calls.
+        UnprocessedItems are retried with backoff; raises if a chunk still cannot be written.
+        """
+        try:
+            # not the raw client: its UnprocessedItems keep blobs as base64 strings, which would be
+            # base64-encoded again on resubmit; the resource's client parses them back into bytes
+            batch_put_items(self.resource.meta.client, self.table_name, items)
+            logger.info(f"{len(items)} users added to table {self.table_name}.")
+        except Exception as e:
+            logger.error(f"Failed to add {len(items)} users: {str(e)}")
+            raise
+
     def query_users_by_tenant(self, tenant_id: str) -> list:
         """
         Query all items for a specific tenant
@@ -158,82 +194,62 @@ class UserRepository:
             DynamoDBError: If there's an error accessing DynamoDB
         """
         try:
-            response = self.table.query(
-                KeyConditionExpression=Key(AppConstants.TENANT_ID).eq(tenant_id)
-            )
-            return response.get('Items', [])
+            return list(self.iter_users_by_tenant(tenant_id))
         except ClientError as e:
             raise e
 
-    def _build_partiql_query(self, rules: Dict[str, Any]) -> str:
+    def iter_users_by_tenant(self, tenant_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield every user of a tenant, following LastEvaluatedKey page by page.
+        Only one page is held in memory at a time.
+        """
+        query_params = {
+            'KeyConditionExpression': _TENANT_KEY_CONDITION,
+            'ExpressionAttributeNames': _TENANT_KEY_NAMES,
+            'ExpressionAttributeValues': {':tenant_id': tenant_id},
+        }
+        for response in paginate(self.table.query, **query_params):
+            yield from response.get('Items', [])
+
+    def _build_partiql_query(self, rules: Dict[str, Any]) -> Tuple[str, List[Dict[str, Any]]]:
         """
         Recursively build a DynamoDB PartiQL WHERE clause from nested rules JSON.
+        Values are never interpolated: each one becomes a `?` placeholder with a typed parameter.
 
         Args:
             rules (Dict[str, Any]): Nested JSON filter rules.
 
         Returns:
-            str: Fully constructed PartiQL WHERE clause string.
+            Tuple[str, List[Dict[str, Any]]]: The WHERE clause and its parameters, in placeholder order.
         """
-
-        def typecast_value(value: Any, dtype: str, for_in: bool = False) -> str:
-            """Typecast Python value to PartiQL literal."""
-            dtype = dtype.lower()
-
-            if isinstance(value, list):
-                # Format list properly: ('a','b','c')
-                formatted_list = ", ".join(typecast_value(v, dtype, for_in=True) for v in value)
-                return f"({formatted_list})"
-
-            if dtype in ("string",):
-                return f"'{value}'"
-            elif dtype in ("int", "integer"):
-                return str(int(value))
-            elif dtype in ("float", "double"):
-                # avoid unnecessary .0 for integers
-                return str(int(value)) if float(value).is_integer() else str(float(value))
-            else:
-                raise ValueError(f"Unsupported dtype: {dtype}")
-
-        def map_operator(op: str) -> str:
-            """Map JSON operator to PartiQL operator."""
-            mapping = {
-                "==": "=",
-                "!=": "<>",
-                ">=": ">=",
-                "<=": "<=",
-                ">": ">",
-                "<": "<",
-                "in": "IN",
-                "not in": "NOT IN"
-            }
-            return mapping.get(op.lower(), op)
+        params: List[Dict[str, Any]] = []
 
         def process_rule(rule: Dict[str, Any]) -> str:
             if "op" in rule and "rules" in rule:
                 # Nested group
                 subclauses = [process_rule(r) for r in rule["rules"]]
                 return "(" + f" {rule['op'].upper()} ".join(subclauses) + ")"
-            else:
-                # Simple condition
-                field = rule["field_name"]
-                operator = map_operator(rule["operator"])
-                value = rule["value"]
-                dtype = rule["dtype"]
 
-                if operator == "IN":
-                    return f"{field} IN {typecast_value(value, dtype)}"
-                else:
-                    return f"{field} {operator} {typecast_value(value, dtype)}"
+            # Simple condition
+            field = rule["field_name"]
+            operator = _PARTIQL_OPERATORS.get(rule["operator"].lower(), rule["operator"])
+            value = rule["value"]
+            convert = _dtype_converter(rule["dtype"])
+
+            if isinstance(value, list):
+                params.extend(map(convert, value))
+                return f"{field} {operator} (" + ", ".join("?" * len(value)) + ")"
+            params.append(convert(value))
+            return f"{field} {operator} ?"
 
-        return process_rule(rules)
+        return process_rule(rules), params
 
     def query_with_rules(self, rules: Dict[str, Any],tenant_id:str) -> QueryResponse:
         """
         Build and execute a PartiQL query from nested filter rules JSON.
         """
-        where_clause = self._build_partiql_query(rules)
-        statement = f"SELECT * FROM {self.table_name} WHERE tenant_id = '{tenant_id}' AND {where_clause}"
+        where_clause, params = self._build_partiql_query(rules)
+        statement = f"SELECT * FROM {self.table_name} WHERE tenant_id = ? AND {where_clause}"
         logger.info(f"Generated PartiQL: {statement}")
-        items = self.execute_partiql(statement)
+        items = self.execute_partiql(statement, [serializer.serialize(tenant_id)] + params)
         return QueryResponse(users=items, count=len(items))
\ No newline at end of file
@@ -1,11 +1,12 @@
-from typing import Dict, Optional
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
 
 from personalize_commons.constants.app_constants import AppConstants
 from personalize_commons.constants.db_constants import DBConstants
 from personalize_commons.entity.intraction_tracking_entity import InteractionTrackingEntity
 from personalize_commons.repositories.intraction_entity_tracking_repository import InteractionTrackingRepository
 from personalize_commons.repositories.intraction_user_tracker_repository import InteractionUserTrackerRepository
-from personalize_commons.utils.datetime_utils import ist_now
+from personalize_commons.utils.datetime_utils import ist_month
 
 # Entities
 from personalize_commons.entity.intraction_user_tracker_entity import IntractionUserTrackerEntity
@@ -40,7 +41,7 @@ class InteractionTrackingService:
         Returns dict with metadata about what was updated.
         """
         if month is None:
-            month = ist_now().strftime("%Y-%m")
+            month = ist_month()
 
         result = {
             AppConstants.TENANT_ID: tenant_id,
@@ -56,17 +57,58 @@ class InteractionTrackingService:
             month=month,
         )
         is_first_time = self.user_tracker_repo.mark_user_seen_once(tracker_entity)
-        if is_first_time:
-            self.tracking_repo.increment_unique_users(tenant_id, month, by=1)
-            result["unique_user_incremented"] = True
+        result["unique_user_incremented"] = is_first_time
 
-        # Step 2: Update interaction counters (optional)
+        # Step 2: Update interaction counters (optional); a new user is counted in the same write
         if event_increments:
-            updated = self.tracking_repo.update_interactions(tenant_id, event_increments, month)
+            updated = self.tracking_repo.update_interactions(
+                tenant_id, event_increments, month, unique_users_increment=1 if is_first_time else 0
+            )
             result["interactions_updated"] = updated
+            # the user is already marked as seen, so a failed write must not lose their count
+            if is_first_time and updated.get("ok") is False:
+                self.tracking_repo.increment_unique_users(tenant_id, month, by=1)
+        elif is_first_time:
+            self.tracking_repo.increment_unique_users(tenant_id, month, by=1)
 
         return result
 
+    def track_interactions(
+        self,
+        tenant_id: str,
+        events: Iterable[Tuple[str, Dict[str, int]]],
+        month: Optional[str] = None,
+    ) -> dict:
+        """
+        Batch form of track_interaction for one request / consumer batch of (user_id, event_increments).
+        New users are counted with one unique_users increment and all event counters are summed
+        into one interactions update, instead of up to two DynamoDB writes per event.
+        """
+        if month is None:
+            month = ist_month()
+
+        new_users = 0
+        increments = Counter()
+        for user_id, event_increments in events:
+            tracker_entity = IntractionUserTrackerEntity(tenant_id=tenant_id, user_id=user_id, month=month)
+            if self.user_tracker_repo.mark_user_seen_once(tracker_entity):
+                new_users += 1
+            if event_increments:
+                increments.update(event_increments)
+
+        # one write for the whole batch: event counters and new users together
+        updated = self.tracking_repo.update_interactions(tenant_id, dict(increments), month,
+                                                         unique_users_increment=new_users)
+        # new users are already marked as seen, so a failed write must not lose their count
+        if new_users and increments and updated.get("ok") is False:
+            self.tracking_repo.increment_unique_users(tenant_id, month, by=new_users)
+
+        return {
+            AppConstants.TENANT_ID: tenant_id,
+            DBConstants.MONTH: month,
+            "unique_users_incremented": new_users,
+        }
+
     def get_monthly_summary(
         self, tenant_id: str, month: Optional[str] = None
     ) -> InteractionTrackingEntity:
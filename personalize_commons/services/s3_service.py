@@ -1,12 +1,13 @@
-import json
-import os
+import time
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
 
 import boto3
 from botocore.exceptions import ClientError
 
+from personalize_commons.dependencies.aws_providers import get_env
 from personalize_commons.exception.s3_upload_exception import S3UploadException
+from personalize_commons.utils import json_utils
 from decimal import Decimal
 from datetime import datetime, date
 import uuid
@@ -28,9 +29,45 @@ def safe_json_serializer(obj):
         return None
     return str(obj)
 
+
+class _MultipartUpload:
+    """One S3 multipart upload, built part by part; callers abort() it on failure so no orphaned parts are billed."""
+
+    def __init__(self, client, bucket: str, key: str):
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.upload_id = client.create_multipart_upload(
+            Bucket=bucket, Key=key, ContentType='application/jsonl'
+        )['UploadId']
+        self.parts: List[Dict[str, Any]] = []
+
+    def upload_part(self, body: bytes) -> None:
+        response = self.client.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+            PartNumber=len(self.parts) + 1, Body=body
+        )
+        self.parts.append({'PartNumber': len(self.parts) + 1, 'ETag': response['ETag']})
+
+    def complete(self, last_part: bytes) -> None:
+        # a non-empty tail becomes the final part (the only part allowed to be under 5 MB)
+        if last_part:
+            self.upload_part(last_part)
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+            MultipartUpload={'Parts': self.parts}
+        )
+
+    def abort(self) -> None:
+        self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+
+
 class S3Service:
     """Service for handling S3 operations for JSONL files."""
 
+    # JSONL uploads larger than one part are sent as multipart uploads (S3 minimum part size is 5 MiB)
+    MULTIPART_PART_SIZE = 8 * 1024 * 1024
+
     def __init__(self,client ):
         """
         Initialize the S3 service.
@@ -38,7 +75,7 @@ class S3Service:
         Args:
             bucket_name: Name of the S3 bucket. If not provided, will use S3_BUCKET from environment.
         """
-        self.bucket_name = os.getenv('AWS_S3_BUCKET_NAME')
+        self.bucket_name = get_env('AWS_S3_BUCKET_NAME')
         if not self.bucket_name:
             raise ValueError("S3_BUCKET environment variable must be set")
 
@@ -62,13 +99,13 @@ class S3Service:
         Returns:
             str: S3 key for the JSONL file
         """
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
         filename = f"{recommendation_id}_{timestamp}.jsonl"
         return f"recommendations/{tenant_id}/{campaign_id}/{filename}"
 
     def upload_jsonl(
             self,
-            data: List[Dict[str, Any]],
+            data: Iterable[Dict[str, Any]],
             tenant_id: str,
             recommendation_id: str,
             campaign_id: str,
@@ -77,7 +114,7 @@ class S3Service:
         Upload data as JSONL to S3.
 
         Args:
-            data: List of dictionaries to be saved as JSONL
+            data: Dictionaries to be saved as JSONL; any iterable, consumed once
             tenant_id: Tenant identifier
             recommendation_id: Recommendation identifier
             filename: Optional custom filename (without extension)
@@ -93,19 +130,40 @@ class S3Service:
             :param campaign_id:
         """
         try:
-            # Convert data to JSONL format
-            jsonl_content = "\n".join(json.dumps(item,default=safe_json_serializer) for item in data)
-
             # Generate S3 key
             s3_key = self._get_s3_key(tenant_id, recommendation_id, campaign_id)
 
-            # Upload to S3
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=jsonl_content,
-                ContentType='application/jsonl'
-            )
+            # Encode line by line into a part-sized buffer; small files are a single put_object,
+            # larger ones are streamed as a multipart upload so only one part is held in memory
+            buffer = bytearray()
+            upload = None
+            try:
+                for item in data:
+                    if buffer:
+                        buffer += b"\n"
+                    buffer += json_utils.dumps(item, default=safe_json_serializer)
+                    if len(buffer) >= self.MULTIPART_PART_SIZE:
+                        if upload is None:
+                            upload = _MultipartUpload(self.s3_client, self.bucket_name, s3_key)
+                        # parts are joined back to back, so the line break goes at the end of this part
+                        buffer += b"\n"
+                        upload.upload_part(bytes(buffer))
+                        buffer.clear()
+
+                if upload is None:
+                    # Upload to S3
+                    self.s3_client.put_object(
+                        Bucket=self.bucket_name,
+                        Key=s3_key,
+                        Body=bytes(buffer),
+                        ContentType='application/jsonl'
+                    )
+                else:
+                    upload.complete(bytes(buffer))
+            except BaseException:
+                if upload is not None:
+                    upload.abort()
+                raise
 
             # Generate and return the S3 URL
             return s3_key
@@ -124,9 +182,9 @@ class S3Service:
                 Bucket=self.bucket_name,
                 Key=s3key
             )
-            # Read and parse JSONL content
-            content = response['Body'].read().decode('utf-8')
-            return [json.loads(line) for line in content.splitlines() if line.strip()]
+            # Read and parse JSONL content (bytes are parsed directly, no decode pass)
+            content = response['Body'].read()
+            return [json_utils.loads(line) for line in content.splitlines() if line.strip()]
 
         except ClientError as e:
             if e.response['Error']['Code'] == 'NoSuchKey':
@@ -0,0 +1,25 @@
+from personalize_commons.entity.intraction_user_tracker_entity import IntractionUserTrackerEntity
+
+
+def entity():
+    return IntractionUserTrackerEntity(tenant_id="t1", user_id="u1", month="2025-08")
+
+
+def test_tenant_month_is_composite_key():
+    assert entity().tenant_month == "t1#2025-08"
+
+
+def test_model_dump_keys_unchanged_after_tenant_month_access():
+    tracker = entity()
+    tracker.tenant_month
+
+    assert set(tracker.model_dump()) == {"tenant_id", "user_id", "month", "expire_at"}
+    assert "tenant_month" not in tracker.model_dump_json()
+    assert tracker == entity()
+
+
+def test_model_copy_recomputes_tenant_month():
+    tracker = entity()
+    tracker.tenant_month
+
+    assert tracker.model_copy(update={"month": "2025-09"}).tenant_month == "t1#2025-09"
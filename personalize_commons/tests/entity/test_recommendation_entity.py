@@ -0,0 +1,117 @@
+from collections import Counter
+from datetime import datetime
+
+import pytest
+
+from personalize_commons.entity.campaign_entity import CampaignEntity, CampaignStatus
+from personalize_commons.entity.recommendation_entity import RecommendationEntity, RecommendationStatus, Flow, \
+    RecommendationMetrics, MetricsAggregator
+
+
+@pytest.fixture
+def campaign():
+    return CampaignEntity(
+        campaign_id="campaign_1",
+        campaign_name="Summer Sale",
+        industry_type="E-commerce",
+        target_segment=None,
+        message_template={"body": "Hello"},
+        tenant_id="tenant123",
+        status=CampaignStatus.ACTIVE,
+    )
+
+
+@pytest.fixture
+def recommendation():
+    return RecommendationEntity(
+        tenant_id="tenant123",
+        recommendation_id="recommendation_1",
+        campaign_id="campaign_1",
+        flows=[Flow.RECOMMENDATION_TRIGGERED],
+        created_at=datetime(2025, 7, 23, 12, 34, 56),
+        updated_at=datetime(2025, 7, 23, 12, 35, 0),
+    )
+
+
+def test_campaign_to_dynamodb_item_status_is_string(campaign):
+    item = campaign.to_dynamodb_item()
+    assert item['status'] == "ACTIVE"
+    assert type(item['status']) is str
+
+
+def test_recommendation_to_dynamodb_item(recommendation):
+    item = recommendation.to_dynamodb_item()
+    assert item['status'] == "RUNNING"
+    assert type(item['status']) is str
+    assert all(type(flow) is str for flow in item['flows'])
+    assert item['created_at'] == "2025-07-23T12:34:56"
+    assert item['updated_at'] == "2025-07-23T12:35:00"
+    assert 'completed_at' not in item
+    assert 'recom_file_key' not in item
+
+
+def test_recommendation_round_trip(recommendation):
+    entity = RecommendationEntity.from_dynamodb_item(recommendation.to_dynamodb_item())
+    assert entity.status is RecommendationStatus.RUNNING
+    assert entity.flows == [Flow.RECOMMENDATION_TRIGGERED] and type(entity.flows[0]) is Flow
+    assert entity.created_at == recommendation.created_at
+    assert entity.updated_at == recommendation.updated_at
+
+
+def test_campaign_from_dynamodb_item_does_not_mutate_item(campaign):
+    item = campaign.to_dynamodb_item()
+    entity = CampaignEntity.from_dynamodb_item(item)
+    assert entity.status == CampaignStatus.ACTIVE
+    assert item['status'] == "ACTIVE"
+
+
+def test_recommendation_from_dynamodb_item_keeps_recom_file_key(recommendation):
+    item = recommendation.to_dynamodb_item()
+    item['recom_file_key'] = "recommendations/tenant123/campaign_1/recommendation_1.jsonl"
+    entity = RecommendationEntity.from_dynamodb_item(item)
+    assert entity.recom_file_key == "recommendations/tenant123/campaign_1/recommendation_1.jsonl"
+
+
+def test_metrics_aggregator_totals_and_means():
+    first = RecommendationMetrics.empty().model_copy(update={"recommended_users": 4, "message_failed_count": 1})
+    second = RecommendationMetrics.empty().model_copy(update={"recommended_users": 2})
+    aggregator = MetricsAggregator([first, second])
+
+    totals = aggregator.totals()
+    assert totals.recommended_users == 6
+    assert totals.message_failed_count == 1
+    assert totals.default_users == 0
+    assert aggregator.means()["recommended_users"] == 3.0
+
+
+def test_metrics_aggregator_empty():
+    aggregator = MetricsAggregator([])
+    assert aggregator.totals() == RecommendationMetrics.empty()
+    assert aggregator.means()["recommended_users"] == 0.0
+
+
+def test_metrics_counter_round_trip_and_sum():
+    first = RecommendationMetrics.empty().model_copy(update={"recommended_users": 4, "message_failed_count": 1})
+    second = RecommendationMetrics.empty().model_copy(update={"recommended_users": 2})
+
+    assert RecommendationMetrics.from_counter(first.to_counter()) == first
+    assert RecommendationMetrics.from_counter(sum([first.to_counter(), second.to_counter()], Counter())) \
+        == RecommendationMetrics.sum([first, second])
+    assert RecommendationMetrics.sum([first, second]).recommended_users == 6
+
+
+def test_recommendation_from_dynamodb_items(recommendation):
+    items = [recommendation.to_dynamodb_item(), recommendation.to_dynamodb_item()]
+    entities = RecommendationEntity.from_dynamodb_items(items)
+    assert len(entities) == 2
+    assert all(isinstance(e, RecommendationEntity) for e in entities)
+    assert entities[0].created_at == recommendation.created_at
+
+
+def test_recommendation_of_campaign(campaign):
+    entity = RecommendationEntity.of(campaign)
+    assert entity.campaign_id == campaign.campaign_id
+    assert entity.metadata['campaign_name'] == "Summer Sale"
+    assert entity.created_at == entity.updated_at
+    assert entity.to_dynamodb_item()['metadata']['status'] == "ACTIVE"
+
@@ -0,0 +1,46 @@
+import pytest
+
+from personalize_commons.model.message_template_model import MessageTemplate
+
+
+@pytest.fixture
+def template():
+    return MessageTemplate(
+        channel="Email",
+        variables=["name", "discount"],
+        body="Hello {name}, get {discount:.0f}% off! {{promo}}",
+        subject="Offer for {name!s}",
+    )
+
+
+def test_render_matches_str_format(template):
+    rendered = template.render(name="Asha", discount=15.0)
+    assert rendered['body'] == "Hello Asha, get 15% off! {promo}"
+    assert rendered['subject'] == "Offer for Asha"
+    assert rendered['channel'] == "Email"
+
+
+def test_render_falls_back_for_attribute_fields():
+    class User:
+        name = "Asha"
+
+    template = MessageTemplate(channel="SMS", variables=["user"], body="Hi {user.name}")
+    assert template.render(user=User())['body'] == "Hi Asha"
+
+
+def test_render_missing_variables(template):
+    with pytest.raises(ValueError) as excinfo:
+        template.render(name="Asha")
+    assert "discount" in str(excinfo.value)
+
+
+def test_template_is_frozen(template):
+    with pytest.raises(ValueError):
+        template.variables = ["name"]
+
+
+def test_render_checks_variables_of_a_copy(template):
+    copy = template.model_copy(update={"variables": ["name", "discount", "code"], "body": "{name} {code}"})
+
+    with pytest.raises(ValueError, match="Missing required variables: code"):
+        copy.render(name="Asha", discount=15.0)
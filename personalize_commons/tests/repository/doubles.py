@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+
+class PagedTable:
+    """
+    Table whose query() (and scan()) returns `pages` one response at a time, following ExclusiveStartKey.
+    LastEvaluatedKey is {"page": n}, or the last item's `key_attr` value when one is given.
+    """
+
+    def __init__(self, pages, key_attr=None):
+        self.pages = pages
+        self.calls = []
+        # ExclusiveStartKey that requests each page (None for the first)
+        self.start_keys = [None] + [
+            {key_attr: page[-1][key_attr]} if key_attr else {"page": i + 1} for i, page in enumerate(pages[:-1])
+        ]
+
+    def query(self, **kwargs):
+        self.calls.append(dict(kwargs))
+        page = self.start_keys.index(kwargs.get("ExclusiveStartKey"))
+        response = {"Items": self.pages[page]}
+        if page + 1 < len(self.pages):
+            response["LastEvaluatedKey"] = self.start_keys[page + 1]
+        return response
+
+    scan = query
+
+
+class DummyResource:
+    """boto3 resource whose Table() returns `table` and whose meta.client is `client`."""
+
+    def __init__(self, table=None, client=None):
+        self.table = table
+        self.meta = SimpleNamespace(client=client)
+
+    def Table(self, name):
+        return self.table
@@ -0,0 +1,155 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+from botocore.exceptions import ClientError
+
+from personalize_commons.entity.campaign_entity import CampaignEntity
+from personalize_commons.repositories.campaign_repository import CampaignRepository, AsyncCampaignRepository
+from personalize_commons.tests.repository.doubles import DummyResource, PagedTable
+
+
+CAMPAIGN_ITEM = {
+    "tenant_id": "tenant123",
+    "campaign_id": "campaign_1",
+    "campaign_name": "Summer Sale",
+    "industry_type": "E-commerce",
+    "target_segment": None,
+    "message_template": {"body": "Hello"},
+    "status": "DRAFT",
+}
+
+
+class DummyTable:
+    def __init__(self, exists=True):
+        self.exists = exists
+        self.calls = []
+
+    def update_item(self, **kwargs):
+        self.calls.append(kwargs)
+        if not self.exists:
+            raise ClientError({"Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"}},
+                              "UpdateItem")
+        item = dict(CAMPAIGN_ITEM)
+        for name_alias, name in kwargs["ExpressionAttributeNames"].items():
+            item[name] = kwargs["ExpressionAttributeValues"][":" + name_alias[1:]]
+        return {"Attributes": item}
+
+
+class DummyClient:
+    def __init__(self):
+        self.items = {}
+
+    def put_item(self, TableName, Item):
+        self.items[(Item["tenant_id"]["S"], Item["campaign_id"]["S"])] = Item
+
+    def get_item(self, TableName, Key):
+        item = self.items.get((Key["tenant_id"]["S"], Key["campaign_id"]["S"]))
+        return {"Item": item} if item is not None else {}
+
+
+def test_update_campaign_single_round_trip():
+    table = DummyTable()
+    repo = CampaignRepository(DummyResource(table))
+
+    updated = repo.update_campaign("campaign_1", {"status": "ACTIVE", "description": None, "unknown": 1}, "tenant123")
+
+    assert len(table.calls) == 1
+    call = table.calls[0]
+    assert "attribute_exists" in call["ConditionExpression"]
+    assert set(call["ExpressionAttributeNames"].values()) == {"status", "updated_at"}
+    assert updated.status == "ACTIVE"
+    assert updated.updated_at is not None
+
+
+def test_update_campaign_missing_returns_none():
+    repo = CampaignRepository(DummyResource(DummyTable(exists=False)))
+    assert repo.update_campaign("campaign_1", {"status": "ACTIVE"}, "tenant123") is None
+
+
+def test_update_campaign_rejects_tenant_change():
+    table = DummyTable()
+    repo = CampaignRepository(DummyResource(table))
+    with pytest.raises(ValueError):
+        repo.update_campaign("campaign_1", {"tenant_id": "other"}, "tenant123")
+    assert table.calls == []
+
+
+def test_update_campaign_validates_changed_fields():
+    table = DummyTable()
+    repo = CampaignRepository(DummyResource(table))
+    with pytest.raises(ValueError):
+        repo.update_campaign("campaign_1", {"status": "NOT_A_STATUS"}, "tenant123")
+    assert table.calls == []
+
+
+def test_create_and_get_campaign_low_level_round_trip():
+    client = DummyClient()
+    repo = CampaignRepository(DummyResource(DummyTable()), client=client)
+    campaign = CampaignEntity.from_dynamodb_item(
+        {**CAMPAIGN_ITEM, "target_segment": {"conditions": {"age": {"operator": ">", "value": Decimal(18)}}}}
+    )
+
+    repo.create_campaign(campaign)
+    item = client.items[("tenant123", "campaign_1")]
+    assert item["status"] == {"S": "DRAFT"}
+    assert item["description"] == {"NULL": True}
+    assert set(item) == set(CampaignEntity.model_fields)
+
+    fetched = repo.get_campaign("campaign_1", "tenant123")
+    assert fetched == campaign
+    assert repo.get_campaign("missing", "tenant123") is None
+
+
+def test_iter_campaigns_by_updated_at_follows_pages_lazily():
+    pages = [[dict(CAMPAIGN_ITEM, campaign_id=f"campaign_{p}_{i}") for i in range(2)] for p in range(3)]
+    table = PagedTable(pages, key_attr="campaign_id")
+    repo = CampaignRepository(DummyResource(table))
+
+    campaigns = repo.iter_campaigns_by_updated_at("tenant123", status="ACTIVE")
+    first = next(campaigns)
+    assert first.campaign_id == "campaign_0_0"
+    assert len(table.calls) == 1
+
+    rest = list(campaigns)
+    assert [c.campaign_id for c in rest][-1] == "campaign_2_1"
+    assert len(rest) == 5
+    assert table.calls[0]["IndexName"] == "StatusIndex"
+    assert "ExclusiveStartKey" not in table.calls[0]
+    assert table.calls[2]["ExclusiveStartKey"] == {"campaign_id": "campaign_1_1"}
+
+
+def test_async_campaign_repository_gathers_in_order():
+    client = DummyClient()
+    repo = CampaignRepository(DummyResource(DummyTable()), client=client)
+    for campaign_id in ("campaign_1", "campaign_2"):
+        repo.create_campaign(CampaignEntity.from_dynamodb_item(dict(CAMPAIGN_ITEM, campaign_id=campaign_id)))
+
+    async_repo = AsyncCampaignRepository(repo, max_concurrency=2)
+    results = asyncio.run(async_repo.get_campaigns(["campaign_2", "missing", "campaign_1"], "tenant123"))
+
+    assert [c.campaign_id if c else None for c in results] == ["campaign_2", None, "campaign_1"]
+
+
+def test_async_campaign_repository_serves_successive_event_loops():
+    client = DummyClient()
+    repo = CampaignRepository(DummyResource(DummyTable()), client=client)
+    repo.create_campaign(CampaignEntity.from_dynamodb_item(dict(CAMPAIGN_ITEM, campaign_id="campaign_1")))
+    async_repo = AsyncCampaignRepository(repo, max_concurrency=1)
+
+    for _ in range(2):
+        results = asyncio.run(async_repo.get_campaigns(["campaign_1"] * 3, "tenant123"))
+        assert [c.campaign_id for c in results] == ["campaign_1"] * 3
+
+
+def test_get_campaigns_by_updated_at_projection_returns_raw_items():
+    table = PagedTable([[{"campaign_id": "campaign_1", "status": "ACTIVE"}]])
+    repo = CampaignRepository(DummyResource(table))
+
+    result = repo.get_campaigns_by_updated_at("tenant123", status="ACTIVE", projection=["campaign_id", "status"])
+
+    call = table.calls[0]
+    assert call["ProjectionExpression"] == "#p0, #p1"
+    assert call["ExpressionAttributeNames"] == {"#status": "status", "#p0": "campaign_id", "#p1": "status"}
+    assert result["items"] == [{"campaign_id": "campaign_1", "status": "ACTIVE"}]
+    assert result["has_more"] is False
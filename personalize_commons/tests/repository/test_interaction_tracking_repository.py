@@ -0,0 +1,269 @@
+import concurrent.futures.thread
+
+from botocore.exceptions import ClientError
+
+from personalize_commons.repositories import intraction_entity_tracking_repository
+from personalize_commons.repositories.intraction_entity_tracking_repository import InteractionTrackingRepository
+
+
+class DummyClient:
+    def __init__(self, item=None):
+        self.item = item
+        self.calls = []
+
+    def update_item(self, **kwargs):
+        self.calls.append(kwargs)
+        return {"Attributes": {}}
+
+    def get_item(self, **kwargs):
+        return {"Item": self.item} if self.item else {}
+
+    def transact_write_items(self, TransactItems, ClientRequestToken=None):
+        self.calls.append({"TransactItems": TransactItems, "ClientRequestToken": ClientRequestToken})
+        return {}
+
+
+def test_update_interactions_builds_expression():
+    client = DummyClient()
+    repo = InteractionTrackingRepository(client)
+    repo.update_interactions("tenant123", {"purchase": 5, "add_to_cart": 3}, "2025-08")
+
+    call = client.calls[0]
+    assert call["Key"] == {"tenant_id": {"S": "tenant123"}, "month": {"S": "2025-08"}}
+    assert call["ExpressionAttributeNames"] == {"#i": "interactions", "#e0": "add_to_cart", "#e1": "purchase"}
+    assert call["ExpressionAttributeValues"][":v0"] == {"N": "3"}
+    assert call["ExpressionAttributeValues"][":v1"] == {"N": "5"}
+    assert call["UpdateExpression"] == "ADD #i.#e0 :v0, #i.#e1 :v1"
+    assert call["ReturnValues"] == "NONE"
+
+
+def test_update_interactions_return_updated_opt_in():
+    client = DummyClient()
+    repo = InteractionTrackingRepository(client)
+    assert repo.update_interactions("tenant123", {"purchase": 1}, "2025-08") == {"ok": True}
+    assert repo.update_interactions("tenant123", {"purchase": 1}, "2025-08", return_updated=True) == {}
+    assert client.calls[1]["ReturnValues"] == "UPDATED_NEW"
+
+
+def test_update_interactions_shares_equal_values():
+    client = DummyClient()
+    InteractionTrackingRepository(client).update_interactions("tenant123", {"view": 1, "click": 1, "buy": 2}, "2025-08")
+
+    call = client.calls[0]
+    assert call["UpdateExpression"] == "ADD #i.#e0 :v0, #i.#e1 :v1, #i.#e2 :v1"
+    assert call["ExpressionAttributeNames"] == {"#i": "interactions", "#e0": "buy", "#e1": "click", "#e2": "view"}
+    assert call["ExpressionAttributeValues"] == {":v0": {"N": "2"}, ":v1": {"N": "1"}}
+
+
+class MissingMapClient(DummyClient):
+    message = "The document path provided in the update expression is invalid for update"
+
+    def update_item(self, **kwargs):
+        self.calls.append(kwargs)
+        if kwargs["UpdateExpression"].startswith("ADD #i."):
+            raise ClientError({"Error": {"Code": "ValidationException", "Message": self.message}}, "UpdateItem")
+        return {}
+
+
+def test_update_interactions_seeds_missing_map():
+    client = MissingMapClient()
+    result = InteractionTrackingRepository(client).update_interactions("tenant123", {"purchase": 2}, "2025-08")
+
+    assert result == {"ok": True, "created": True}
+    seed = client.calls[1]
+    assert seed["UpdateExpression"] == "SET interactions = :m"
+    assert seed["ConditionExpression"] == "attribute_not_exists(interactions)"
+    assert seed["ExpressionAttributeValues"][":m"] == {"M": {"purchase": {"N": "2"}}}
+
+
+def test_update_interactions_does_not_seed_on_other_validation_errors():
+    client = MissingMapClient()
+    client.message = "An operand in the update expression has an incorrect data type"
+    result = InteractionTrackingRepository(client).update_interactions("tenant123", {"purchase": 2}, "2025-08")
+
+    assert result["ok"] is False
+    assert len(client.calls) == 1
+
+
+def test_update_interactions_empty_is_noop():
+    client = DummyClient()
+    assert InteractionTrackingRepository(client).update_interactions("tenant123", {}, "2025-08") == {"ok": True}
+    assert client.calls == []
+
+
+def test_increment_unique_users():
+    client = DummyClient()
+    InteractionTrackingRepository(client).increment_unique_users("tenant123", "2025-08", by=2)
+
+    call = client.calls[0]
+    assert "ADD unique_users :by" in call["UpdateExpression"]
+    assert call["ExpressionAttributeValues"][":by"] == {"N": "2"}
+
+
+def test_get_interactions():
+    client = DummyClient(item={
+        "tenant_id": {"S": "tenant123"},
+        "month": {"S": "2025-08"},
+        "interactions": {"M": {"purchase": {"N": "5"}}},
+        "unique_users": {"N": "7"},
+    })
+    entity = InteractionTrackingRepository(client).get_interactions("tenant123", "2025-08")
+    assert entity.interactions == {"purchase": 5}
+    assert entity.unique_users == 7
+
+
+def test_get_interactions_missing_item():
+    entity = InteractionTrackingRepository(DummyClient()).get_interactions("tenant123", "2025-08")
+    assert entity.interactions == {}
+    assert entity.unique_users == 0
+
+
+def test_buffer_interactions_merges_per_tenant_month():
+    client = DummyClient()
+    repo = InteractionTrackingRepository(client)
+    repo.buffer_interactions("tenant123", {"purchase": 1}, "2025-08")
+    repo.buffer_interactions("tenant123", {"purchase": 2, "view": 1}, "2025-08")
+    repo.buffer_interactions("tenant456", {"view": 1}, "2025-08")
+    assert client.calls == []
+
+    repo.flush()
+    assert len(client.calls) == 1
+    updates = [op["Update"] for op in client.calls[0]["TransactItems"]]
+    assert len(updates) == 2
+    first = updates[0]
+    assert first["Key"]["tenant_id"] == {"S": "tenant123"}
+    assert first["ExpressionAttributeValues"][":v0"] == {"N": "3"}
+    assert first["ExpressionAttributeValues"][":v1"] == {"N": "1"}
+
+    repo.flush()
+    assert len(client.calls) == 1
+
+
+def test_flush_at_interpreter_exit_writes_inline(monkeypatch):
+    # after interpreter shutdown starts, ThreadPoolExecutor.submit raises instead of scheduling
+    monkeypatch.setattr(concurrent.futures.thread, "_shutdown", True)
+    client = DummyClient()
+    repo = InteractionTrackingRepository(client)
+    repo.TRANSACT_MAX_ITEMS = 1
+    repo.buffer_interactions("tenant123", {"view": 1}, "2025-08")
+    repo.buffer_interactions("tenant456", {"view": 1}, "2025-08")
+
+    repo.flush()
+    assert len([call for call in client.calls if "TransactItems" in call]) == 2
+
+
+def test_update_interactions_bulk_chunks_and_falls_back():
+    class CancellingClient(DummyClient):
+        def transact_write_items(self, TransactItems, ClientRequestToken=None):
+            super().transact_write_items(TransactItems, ClientRequestToken)
+            raise ClientError({"Error": {"Code": "TransactionCanceledException", "Message": "cancelled"}},
+                              "TransactWriteItems")
+
+    client = CancellingClient()
+    repo = InteractionTrackingRepository(client)
+    repo.TRANSACT_MAX_ITEMS = 2
+    result = repo.update_interactions_bulk([(f"tenant{i}", "2025-08", {"view": 1}) for i in range(3)])
+
+    transactions = [call for call in client.calls if "TransactItems" in call]
+    assert sorted(len(call["TransactItems"]) for call in transactions) == [1, 2]
+    tokens = {call["ClientRequestToken"] for call in transactions}
+    assert None not in tokens and len(tokens) == 2
+    assert len([call for call in client.calls if "UpdateExpression" in call]) == 3
+    assert result == {"ok": True, "records": 3, "failed": 0}
+
+
+def test_increment_unique_users_bulk_merges_per_tenant_month():
+    client = DummyClient()
+    result = InteractionTrackingRepository(client).increment_unique_users_bulk(
+        [("tenant123", "2025-08", 1), ("tenant123", "2025-08", 1), ("tenant456", "2025-08", 1)]
+    )
+
+    updates = [op["Update"] for op in client.calls[0]["TransactItems"]]
+    assert [u["ExpressionAttributeValues"][":by"] for u in updates] == [{"N": "2"}, {"N": "1"}]
+    assert client.calls[0]["ClientRequestToken"]
+    assert result["ok"] is True
+
+
+def test_buffer_interactions_flushes_at_threshold():
+    client = DummyClient()
+    repo = InteractionTrackingRepository(client)
+    repo.buffer_interactions("tenant123", {"purchase": InteractionTrackingRepository.FLUSH_THRESHOLD}, "2025-08")
+    assert len(client.calls) == 1
+
+
+def test_get_interactions_is_memoized_until_write():
+    class CountingClient(DummyClient):
+        reads = 0
+
+        def get_item(self, **kwargs):
+            self.reads += 1
+            return super().get_item(**kwargs)
+
+    client = CountingClient(item={"interactions": {"M": {"purchase": {"N": "5"}}}})
+    repo = InteractionTrackingRepository(client)
+    repo.get_interactions("tenant123", "2025-08")
+    repo.get_interactions("tenant123", "2025-08")
+    assert client.reads == 1
+
+    repo.update_interactions("tenant123", {"purchase": 1}, "2025-08")
+    repo.get_interactions("tenant123", "2025-08")
+    assert client.reads == 2
+
+
+def test_pending_increments_flush_once_on_exit():
+    client = DummyClient()
+    repo = InteractionTrackingRepository(client)
+    with repo.buffer() as buf:
+        buf.add("tenant123", "view", month="2025-08")
+        buf.add("tenant123", "view", month="2025-08")
+        buf.add("tenant123", "purchase", 2, month="2025-08")
+        assert client.calls == []
+
+    assert len(client.calls) == 1
+    call = client.calls[0]
+    assert call["ExpressionAttributeNames"] == {"#i": "interactions", "#e0": "purchase", "#e1": "view"}
+    assert call["ExpressionAttributeValues"] == {":v0": {"N": "2"}}
+
+
+def test_update_interactions_coalesces_unique_users():
+    client = DummyClient()
+    InteractionTrackingRepository(client).update_interactions("tenant123", {"view": 1}, "2025-08",
+                                                              unique_users_increment=1)
+
+    call = client.calls[0]
+    assert call["UpdateExpression"] == "ADD #i.#e0 :v0, unique_users :u"
+    assert call["ExpressionAttributeValues"] == {":v0": {"N": "1"}, ":u": {"N": "1"}}
+
+
+def test_update_interactions_seeds_map_with_unique_users():
+    client = MissingMapClient()
+    InteractionTrackingRepository(client).update_interactions("tenant123", {"view": 1}, "2025-08",
+                                                              unique_users_increment=2)
+
+    seed = client.calls[1]
+    assert seed["UpdateExpression"] == "SET interactions = :m ADD unique_users :u"
+    assert seed["ExpressionAttributeValues"][":u"] == {"N": "2"}
+
+
+def test_exit_hook_flushes_only_buffered_repositories():
+    idle = InteractionTrackingRepository(DummyClient())
+    client = DummyClient()
+    repo = InteractionTrackingRepository(client)
+    repo.buffer_interactions("tenant123", {"view": 1}, "2025-08")
+    assert idle not in intraction_entity_tracking_repository._buffered_repositories
+
+    intraction_entity_tracking_repository._flush_buffered_repositories()
+    assert len(client.calls) == 1
+    assert repo not in intraction_entity_tracking_repository._buffered_repositories
+
+
+def test_buffer_interactions_keeps_running_pending_count():
+    client = DummyClient()
+    repo = InteractionTrackingRepository(client)
+    repo.buffer_interactions("tenant123", {"view": InteractionTrackingRepository.FLUSH_THRESHOLD - 1}, "2025-08")
+    assert client.calls == []
+
+    repo.buffer_interactions("tenant456", {"view": 1}, "2025-08")
+    assert len(client.calls) == 1
+    repo.buffer_interactions("tenant123", {"view": 1}, "2025-08")
+    assert len(client.calls) == 1
@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+from personalize_commons.entity.intraction_user_tracker_entity import IntractionUserTrackerEntity
+from personalize_commons.repositories.intraction_user_tracker_repository import InteractionUserTrackerRepository
+
+
+class ConditionalCheckFailedException(Exception):
+    pass
+
+
+class DummyClient:
+    exceptions = SimpleNamespace(ConditionalCheckFailedException=ConditionalCheckFailedException)
+
+    def __init__(self, existing=()):
+        self.items = set(existing)
+        self.puts = []
+
+    def put_item(self, **kwargs):
+        self.puts.append(kwargs)
+        key = (kwargs["Item"]["tenant_month"]["S"], kwargs["Item"]["user_id"]["S"])
+        if key in self.items:
+            raise ConditionalCheckFailedException()
+        self.items.add(key)
+
+
+def test_mark_user_seen_once_skips_dynamodb_for_known_users():
+    client = DummyClient()
+    repo = InteractionUserTrackerRepository(client)
+    entity = IntractionUserTrackerEntity(tenant_id="tenant123", user_id="user1", month="2025-08")
+
+    assert repo.mark_user_seen_once(entity) is True
+    assert repo.mark_user_seen_once(entity) is False
+    assert len(client.puts) == 1
+
+
+def test_mark_user_seen_once_remembers_existing_users():
+    client = DummyClient(existing={("tenant123#2025-08", "user1")})
+    repo = InteractionUserTrackerRepository(client)
+    entity = IntractionUserTrackerEntity(tenant_id="tenant123", user_id="user1", month="2025-08")
+
+    assert repo.mark_user_seen_once(entity) is False
+    assert repo.mark_user_seen_once(entity) is False
+    assert len(client.puts) == 1
+    assert repo.mark_user_seen_once(entity.model_copy(update={"month": "2025-09"})) is True
+
+
+def test_mark_user_seen_once_reuses_expire_at_within_the_minute():
+    client = DummyClient()
+    repo = InteractionUserTrackerRepository(client)
+    repo.mark_user_seen_once(IntractionUserTrackerEntity(tenant_id="tenant123", user_id="user1", month="2025-08"))
+    repo.mark_user_seen_once(IntractionUserTrackerEntity(tenant_id="tenant123", user_id="user2", month="2025-08"))
+    repo.mark_user_seen_once(IntractionUserTrackerEntity(tenant_id="tenant123", user_id="user3", month="2025-08",
+                                                         expire_at=123))
+
+    first, second, explicit = (put["Item"]["expire_at"] for put in client.puts)
+    assert first is second
+    assert abs(int(first["N"]) - repo._compute_ttl_epoch()) <= 60
+    assert explicit == {"N": "123"}
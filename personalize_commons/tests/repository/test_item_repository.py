@@ -0,0 +1,53 @@
+from personalize_commons.repositories.item_repository import ItemRepository
+from personalize_commons.tests.repository.doubles import DummyResource, PagedTable
+
+
+class DummyClient:
+    def __init__(self, unprocessed_once=False):
+        self.unprocessed_once = unprocessed_once
+        self.calls = []
+        self.written = []
+
+    def batch_write_item(self, RequestItems):
+        self.calls.append(RequestItems)
+        requests = RequestItems["Items"]
+        if self.unprocessed_once:
+            self.unprocessed_once = False
+            self.written.extend(requests[1:])
+            return {"UnprocessedItems": {"Items": requests[:1]}}
+        self.written.extend(requests)
+        return {"UnprocessedItems": {}}
+
+
+def test_batch_add_items_chunks_and_skips_invalid():
+    client = DummyClient()
+    repo = ItemRepository(DummyResource(client=client))
+    items = [{"tenant_id": "tenant123", "item_id": f"item_{i}", "price": i} for i in range(30)]
+
+    repo.batch_add_items(items + [{"tenant_id": "tenant123"}])
+
+    assert sorted(len(call["Items"]) for call in client.calls) == [5, 25]
+    assert len(client.written) == 30
+    assert client.written[0]["PutRequest"]["Item"]["price"] == {"N": "0"}
+
+
+def test_batch_add_items_retries_unprocessed():
+    client = DummyClient(unprocessed_once=True)
+    repo = ItemRepository(DummyResource(client=client))
+
+    repo.batch_add_items([{"tenant_id": "tenant123", "item_id": f"item_{i}"} for i in range(3)])
+
+    assert len(client.calls) == 2
+    assert len(client.calls[1]["Items"]) == 1
+    assert len(client.written) == 3
+
+
+def test_query_items_by_tenant_follows_pages_with_projection():
+    table = PagedTable([[{"item_id": "item_1"}], [{"item_id": "item_2"}]], key_attr="item_id")
+    repo = ItemRepository(DummyResource(table=table))
+
+    assert repo.query_items_by_tenant("tenant123", projection=["item_id"]) == [{"item_id": "item_1"},
+                                                                               {"item_id": "item_2"}]
+    assert table.calls[0]["ProjectionExpression"] == "#p0"
+    assert table.calls[0]["ExpressionAttributeNames"] == {"#p0": "item_id"}
+    assert table.calls[1]["ExclusiveStartKey"] == {"item_id": "item_1"}
@@ -0,0 +1,239 @@
+from datetime import datetime
+
+import pytest
+from botocore.exceptions import ClientError
+
+from personalize_commons.constants.context import tenant_id_ctx
+from personalize_commons.entity.recommendation_entity import RecommendationEntity, RecommendationStatus, Flow
+from personalize_commons.repositories.recommendation_repository import RecommendationRepository
+from personalize_commons.tests.repository.doubles import DummyResource, PagedTable
+
+
+def _client_error(code):
+    return ClientError({"Error": {"Code": code, "Message": code}}, "operation")
+
+
+class DummyTable:
+    def __init__(self):
+        self.items = {}
+        self.calls = []
+
+    def put_item(self, Item, ConditionExpression=None):
+        self.calls.append(("put_item", ConditionExpression))
+        key = (Item["tenant_id"], Item["recommendation_id"])
+        if ConditionExpression and key in self.items:
+            raise _client_error("ConditionalCheckFailedException")
+        self.items[key] = Item
+        return {}
+
+    def update_item(self, Key, UpdateExpression, ConditionExpression, ExpressionAttributeNames,
+                    ExpressionAttributeValues, ReturnValues):
+        self.calls.append(("update_item", ConditionExpression))
+        key = (Key["tenant_id"], Key["recommendation_id"])
+        if key not in self.items:
+            raise _client_error("ConditionalCheckFailedException")
+        item = dict(self.items[key])
+        for alias, name in ExpressionAttributeNames.items():
+            item[name] = ExpressionAttributeValues[":" + alias[1:]]
+        self.items[key] = item
+        return {"Attributes": item}
+
+    def get_item(self, Key, ConsistentRead=False):
+        self.calls.append(("get_item", ConsistentRead))
+        item = self.items.get((Key["tenant_id"], Key["recommendation_id"]))
+        return {"Item": item} if item is not None else {}
+
+
+class BatchGetResource(DummyResource):
+    def __init__(self, table):
+        super().__init__(table)
+        self.batch_calls = []
+
+    def batch_get_item(self, RequestItems):
+        (table_name, request), = RequestItems.items()
+        self.batch_calls.append(len(request["Keys"]))
+        keys = request["Keys"]
+        # the first call of a batch leaves its last key unprocessed
+        unprocessed = keys[-1:] if len(self.batch_calls) == 1 else []
+        found = [self.table.items[(k["tenant_id"], k["recommendation_id"])] for k in keys
+                 if k not in unprocessed and (k["tenant_id"], k["recommendation_id"]) in self.table.items]
+        response = {"Responses": {table_name: found}}
+        if unprocessed:
+            response["UnprocessedKeys"] = {table_name: {"Keys": unprocessed}}
+        return response
+
+
+def _entity():
+    return RecommendationEntity(
+        tenant_id="tenant123",
+        recommendation_id="rec1",
+        campaign_id="campaign_1",
+        flows=[Flow.RECOMMENDATION_TRIGGERED],
+        created_at=datetime(2025, 7, 23, 12, 34, 56),
+        updated_at=datetime(2025, 7, 23, 12, 35, 0),
+    )
+
+
+def test_create_recommendation_is_a_single_conditional_put():
+    table = DummyTable()
+    repo = RecommendationRepository(DummyResource(table))
+
+    repo.create_recommendation(_entity())
+
+    assert [call[0] for call in table.calls] == ["put_item"]
+    assert ("tenant123", "rec1") in table.items
+
+
+def test_create_recommendation_rejects_duplicates():
+    table = DummyTable()
+    repo = RecommendationRepository(DummyResource(table))
+    repo.create_recommendation(_entity())
+
+    with pytest.raises(ValueError, match="already exists"):
+        repo.create_recommendation(_entity())
+
+
+def test_update_recommendation_is_a_single_conditional_update():
+    table = DummyTable()
+    repo = RecommendationRepository(DummyResource(table))
+    repo.create_recommendation(_entity())
+    table.calls.clear()
+
+    updated = repo.update_recommendation("rec1", "tenant123", {
+        "status": RecommendationStatus.COMPLETED,
+        "completed_at": datetime(2025, 7, 23, 13, 0, 0),
+        "unknown": "ignored",
+    })
+
+    assert [call[0] for call in table.calls] == ["update_item"]
+    stored = table.items[("tenant123", "rec1")]
+    assert stored["status"] == "COMPLETED"
+    assert stored["completed_at"] == "2025-07-23T13:00:00"
+    assert "unknown" not in stored
+    assert updated.status == RecommendationStatus.COMPLETED
+    assert stored["updated_at"] != "2025-07-23T12:35:00"
+
+
+def test_update_recommendation_returns_none_when_missing():
+    repo = RecommendationRepository(DummyResource(DummyTable()))
+    assert repo.update_recommendation("rec1", "tenant123", {"status": "FAILED"}) is None
+
+
+def test_update_recommendation_rejects_tenant_change():
+    repo = RecommendationRepository(DummyResource(DummyTable()))
+    with pytest.raises(ValueError):
+        repo.update_recommendation("rec1", "tenant123", {"tenant_id": "other"})
+
+
+def test_batch_get_recommendations_chunks_and_retries_unprocessed(monkeypatch):
+    monkeypatch.setattr("personalize_commons.utils.dynamodb_batch.time.sleep", lambda _: None)
+    table = DummyTable()
+    resource = BatchGetResource(table)
+    repo = RecommendationRepository(resource)
+    for i in range(150):
+        repo.create_recommendation(_entity().model_copy(update={"recommendation_id": f"rec{i}"}))
+
+    keys = [("tenant123", f"rec{i}") for i in range(150)] + [("tenant123", "missing")]
+    found = list(repo.batch_get_recommendations(keys))
+
+    assert resource.batch_calls == [100, 1, 51]
+    assert sorted(r.recommendation_id for r in found) == sorted(f"rec{i}" for i in range(150))
+
+
+def test_iter_recommendations_follows_every_page():
+    item = _entity().to_dynamodb_item()
+    pages = [[{**item, "recommendation_id": f"rec{p}-{i}"} for i in range(2)] for p in range(3)]
+    table = PagedTable(pages)
+    repo = RecommendationRepository(DummyResource(table))
+
+    ids = [r.recommendation_id for r in repo.iter_recommendations("tenant123", status="RUNNING")]
+
+    assert ids == [f"rec{p}-{i}" for p in range(3) for i in range(2)]
+    assert len(table.calls) == 3
+    assert table.calls[0]["IndexName"] == table.calls[2]["IndexName"]
+
+
+def test_iter_recommendations_prefetch_keeps_tenant_context():
+    class ContextTable(PagedTable):
+        def query(self, **kwargs):
+            self.tenants = getattr(self, "tenants", []) + [tenant_id_ctx.get()]
+            return super().query(**kwargs)
+
+    item = _entity().to_dynamodb_item()
+    table = ContextTable([[item], [item]])
+    repo = RecommendationRepository(DummyResource(table))
+
+    token = tenant_id_ctx.set("tenant123")
+    try:
+        list(repo.iter_recommendations("tenant123"))
+    finally:
+        tenant_id_ctx.reset(token)
+
+    assert table.tenants == ["tenant123", "tenant123"]
+
+
+def test_read_resource_serves_only_get_item():
+    table, read_table = DummyTable(), DummyTable()
+    repo = RecommendationRepository(DummyResource(table), read_resource=DummyResource(read_table))
+    repo.create_recommendation(_entity())
+    read_table.items = dict(table.items)
+
+    assert repo.get_recommendation("tenant123", "rec1").recommendation_id == "rec1"
+    assert [call[0] for call in table.calls] == ["put_item"]
+    assert [call[0] for call in read_table.calls] == ["get_item"]
+
+
+def test_get_recommendations_projection_returns_raw_items():
+    table = PagedTable([[{"recommendation_id": "rec1", "status": "RUNNING"}]])
+    repo = RecommendationRepository(DummyResource(table))
+
+    page = repo.get_recommendations("tenant123", status="RUNNING", projection=["recommendation_id", "status"])
+
+    query = table.calls[0]
+    assert query["ProjectionExpression"] == "#p0, #p1"
+    assert query["ExpressionAttributeNames"] == {"#status": "status", "#p0": "recommendation_id", "#p1": "status"}
+    assert page["items"] == [{"recommendation_id": "rec1", "status": "RUNNING"}]
+
+
+def test_get_recommendations_raw_skips_entity_conversion():
+    item = _entity().to_dynamodb_item()
+    repo = RecommendationRepository(DummyResource(PagedTable([[item]])))
+
+    page = repo.get_recommendations("tenant123", raw=True)
+
+    assert page["items"] == [item]
+
+
+def test_status_and_date_range_use_composite_index_when_enabled():
+    table = PagedTable([[]])
+    repo = RecommendationRepository(DummyResource(table))
+    repo.use_status_created_at_index = True
+
+    repo.get_recommendations("tenant123", status="RUNNING",
+                             start_date=datetime(2025, 7, 1), end_date=datetime(2025, 7, 15))
+
+    query = table.calls[0]
+    assert query["IndexName"] == "StatusCreatedAtIndex"
+    assert query["ExpressionAttributeValues"][":tenant_status"] == "tenant123#RUNNING"
+    assert "FilterExpression" not in query
+
+
+def test_composite_index_key_uses_status_value_for_enum():
+    table = PagedTable([[]])
+    repo = RecommendationRepository(DummyResource(table))
+    repo.use_status_created_at_index = True
+
+    repo.get_recommendations("tenant123", status=RecommendationStatus.COMPLETED,
+                             start_date=datetime(2025, 7, 1), end_date=datetime(2025, 7, 15))
+
+    assert table.calls[0]["ExpressionAttributeValues"][":tenant_status"] == "tenant123#COMPLETED"
+
+
+def test_writes_keep_tenant_status_in_step():
+    table = DummyTable()
+    repo = RecommendationRepository(DummyResource(table))
+    repo.create_recommendation(_entity())
+    assert table.items[("tenant123", "rec1")]["tenant_status"] == "tenant123#RUNNING"
+
+    repo.update_recommendation("rec1", "tenant123", {"status": RecommendationStatus.FAILED})
+    assert table.items[("tenant123", "rec1")]["tenant_status"] == "tenant123#FAILED"
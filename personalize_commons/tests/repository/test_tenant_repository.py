@@ -0,0 +1,69 @@
+from personalize_commons.repositories.tenant_repository import TenantRepository
+from personalize_commons.tests.repository.doubles import DummyResource, PagedTable
+
+
+class SegmentedTable:
+    def __init__(self, pages_per_segment):
+        self.pages_per_segment = pages_per_segment
+        self.calls = []
+
+    def scan(self, **kwargs):
+        self.calls.append(dict(kwargs))
+        segment = kwargs["Segment"]
+        page = kwargs.get("ExclusiveStartKey", {}).get("page", 0)
+        response = {"Items": [{"tenant_id": f"t{segment}-{page}"}]}
+        if page + 1 < self.pages_per_segment:
+            response["LastEvaluatedKey"] = {"page": page + 1}
+        return response
+
+
+def test_get_all_tenants_scans_every_segment_to_the_end():
+    table = SegmentedTable(pages_per_segment=2)
+    repo = TenantRepository(DummyResource(table))
+
+    tenants = repo.get_all_tenants(total_segments=3)
+
+    assert sorted(t["tenant_id"] for t in tenants) == [f"t{s}-{p}" for s in range(3) for p in range(2)]
+    assert {call["TotalSegments"] for call in table.calls} == {3}
+    assert len(table.calls) == 6
+
+
+def test_get_all_tenants_caps_segments():
+    table = SegmentedTable(pages_per_segment=1)
+    repo = TenantRepository(DummyResource(table))
+
+    tenants = repo.get_all_tenants(total_segments=500)
+
+    assert len(tenants) == TenantRepository.MAX_SCAN_SEGMENTS
+    assert {call["TotalSegments"] for call in table.calls} == {TenantRepository.MAX_SCAN_SEGMENTS}
+
+
+def test_iter_all_tenants_fetches_pages_lazily():
+    table = PagedTable([[{"tenant_id": "t1"}], [{"tenant_id": "t2"}]])
+    tenants = TenantRepository(DummyResource(table)).iter_all_tenants()
+
+    assert next(tenants) == {"tenant_id": "t1"}
+    assert len(table.calls) == 1
+    assert list(tenants) == [{"tenant_id": "t2"}]
+    assert table.calls[1] == {"ExclusiveStartKey": {"page": 1}}
+
+
+class UpdateTable:
+    def __init__(self):
+        self.calls = []
+
+    def update_item(self, **kwargs):
+        self.calls.append(kwargs)
+        return {"Attributes": {"tenant_id": "t1", "name": "Acme"}}
+
+
+def test_update_tenant_skips_tenant_id_and_aliases_names():
+    table = UpdateTable()
+    repo = TenantRepository(DummyResource(table))
+
+    repo.update_tenant("t1", "a@b.com", {"tenant_id": "other", "name": "Acme", "status": "ACTIVE"})
+
+    call = table.calls[0]
+    assert call["UpdateExpression"] == "SET #name = :name, #status = :status"
+    assert call["ExpressionAttributeNames"] == {"#name": "name", "#status": "status"}
+    assert call["ExpressionAttributeValues"] == {":name": "Acme", ":status": "ACTIVE"}
@@ -3,18 +3,18 @@ from decimal import Decimal
 import pytest
 
 from personalize_commons.repositories.user_repository import UserRepository
+from personalize_commons.tests.repository.doubles import DummyResource, PagedTable
 
 
 class DummyClient:
+    def __init__(self):
+        self.statements = []
+
     def execute_statement(self, **kwargs):
+        self.statements.append(kwargs)
         return {"Items": []}  # Mock empty response
 
 
-class DummyResource:
-    def Table(self, name):
-        return None
-
-
 @pytest.fixture
 def repo():
     return UserRepository(DummyClient(), DummyResource())
@@ -27,8 +27,9 @@ def test_simple_rule(repo):
         "value": 50,
         "dtype": "int"
     }
-    query = repo._build_partiql_query(rules)
-    assert query == "price >= 50"
+    query, params = repo._build_partiql_query(rules)
+    assert query == "price >= ?"
+    assert params == [{"N": "50"}]
 
 def test_not_in_rule(repo):
     rules = {
@@ -37,8 +38,9 @@ def test_not_in_rule(repo):
         "value": [50,100],
         "dtype": "string"
     }
-    query = repo._build_partiql_query(rules)
-    assert query == "name NOT IN ('50', '100')"
+    query, params = repo._build_partiql_query(rules)
+    assert query == "name NOT IN (?, ?)"
+    assert params == [{"S": "50"}, {"S": "100"}]
 
 
 def test_string_equals(repo):
@@ -48,8 +50,9 @@ def test_string_equals(repo):
         "value": "Nike",
         "dtype": "string"
     }
-    query = repo._build_partiql_query(rules)
-    assert query == "brand = 'Nike'"
+    query, params = repo._build_partiql_query(rules)
+    assert query == "brand = ?"
+    assert params == [{"S": "Nike"}]
 
 
 def test_in_operator(repo):
@@ -59,8 +62,9 @@ def test_in_operator(repo):
         "value": ["Shoes", "Sweets"],
         "dtype": "string"
     }
-    query = repo._build_partiql_query(rules)
-    assert query == "category IN ('Shoes', 'Sweets')"
+    query, params = repo._build_partiql_query(rules)
+    assert query == "category IN (?, ?)"
+    assert params == [{"S": "Shoes"}, {"S": "Sweets"}]
 
 
 def test_nested_and_or(repo):
@@ -92,9 +96,10 @@ def test_nested_and_or(repo):
             }
         ]
     }
-    query = repo._build_partiql_query(rules)
-    expected = "(price >= 100 AND (category IN ('Sweets') OR brand = 'Puma'))"
+    query, params = repo._build_partiql_query(rules)
+    expected = "(price >= ? AND (category IN (?) OR brand = ?))"
     assert query == expected
+    assert params == [{"N": "100.0"}, {"S": "Sweets"}, {"S": "Puma"}]
 
 def test_nested_and_or_root_or(repo):
     rules = {
@@ -125,9 +130,10 @@ def test_nested_and_or_root_or(repo):
             }
         ]
     }
-    query = repo._build_partiql_query(rules)
-    expected = "(price >= 100 OR (category IN ('Sweets') OR brand = 'Puma'))"
+    query, params = repo._build_partiql_query(rules)
+    expected = "(price >= ? OR (category IN (?) OR brand = ?))"
     assert query == expected
+    assert params == [{"N": "100.0"}, {"S": "Sweets"}, {"S": "Puma"}]
 
 def test_invalid_dtype(repo):
     rules = {
@@ -146,5 +152,86 @@ def test_string_json(repo):
             {'dtype': 'string', 'value': 'Chennai', 'operator': '==', 'field_name': 'location'},
             {'op': 'OR', 'rules': [{'dtype': 'int', 'value': Decimal('10'), 'operator': '>=', 'field_name': 'age'}]}
         ]}
-    query = repo._build_partiql_query(rules)
-    print(query)
\ No newline at end of file
+    query, params = repo._build_partiql_query(rules)
+    assert query == "(age <= ? AND location = ? AND (age >= ?))"
+    assert params == [{"N": "40"}, {"S": "Chennai"}, {"N": "10"}]
+
+def test_query_with_rules_parameterizes_tenant_and_values(repo):
+    rules = {"field_name": "brand", "operator": "==", "value": "x' OR '1'='1", "dtype": "string"}
+    repo.query_with_rules(rules, tenant_id="tenant123")
+
+    request = repo.dynamodb_client.statements[-1]
+    assert request["Statement"].endswith("WHERE tenant_id = ? AND brand = ?")
+    assert request["Parameters"] == [{"S": "tenant123"}, {"S": "x' OR '1'='1"}]
+
+
+def test_get_all_users_by_tenant_queries_every_page():
+    table = PagedTable([[{"user_id": "u1"}, {"user_id": "u2"}], [{"user_id": "u3"}]])
+    client = DummyClient()
+    repo = UserRepository(client, DummyResource(table))
+
+    response = repo.get_all_users_by_tenant("tenant123")
+
+    assert response.count == 3
+    assert [u["user_id"] for u in response.users] == ["u1", "u2", "u3"]
+    assert len(table.calls) == 2
+    assert table.calls[0]["KeyConditionExpression"] == "#tenant_id = :tenant_id"
+    assert table.calls[1]["ExpressionAttributeValues"] == {":tenant_id": "tenant123"}
+    assert client.statements == []
+
+
+def test_execute_partiql_deserializes_like_boto3():
+    from boto3.dynamodb.types import TypeDeserializer
+
+    item = {
+        "user_id": {"S": "u1"}, "age": {"N": "30.5"}, "active": {"BOOL": True}, "nickname": {"NULL": True},
+        "tags": {"SS": ["a", "b"]}, "scores": {"NS": ["1", "2"]},
+        "profile": {"M": {"city": {"S": "Chennai"}, "visits": {"L": [{"N": "1"}, {"S": "x"}]}}},
+    }
+
+    class Client:
+        def execute_statement(self, **kwargs):
+            return {"Items": [item]}
+
+    repo = UserRepository(Client(), DummyResource())
+    expected = {k: TypeDeserializer().deserialize(v) for k, v in item.items()}
+    assert repo.execute_partiql("SELECT * FROM users") == [expected]
+
+
+def test_execute_partiql_decodes_base64_blobs_from_raw_client():
+    class Client:
+        def execute_statement(self, **kwargs):
+            return {"Items": [{"avatar": {"B": "aGk="}}]}
+
+    repo = UserRepository(Client(), DummyResource())
+    assert repo.execute_partiql("SELECT * FROM users")[0]["avatar"].value == b"hi"
+
+
+def test_add_users_batches_and_retries_unprocessed(monkeypatch):
+    monkeypatch.setattr("personalize_commons.utils.dynamodb_batch.time.sleep", lambda _: None)
+
+    class BatchClient:
+        def __init__(self):
+            self.calls = []
+            self.written = []
+            self.unprocessed_once = True
+
+        def batch_write_item(self, RequestItems):
+            (table_name, requests), = RequestItems.items()
+            self.calls.append(len(requests))
+            if self.unprocessed_once:
+                self.unprocessed_once = False
+                self.written.extend(requests[1:])
+                return {"UnprocessedItems": {table_name: requests[:1]}}
+            self.written.extend(requests)
+            return {"UnprocessedItems": {}}
+
+    client = BatchClient()
+    # batch writes go through the resource's parsing client, not the raw client
+    repo = UserRepository(DummyClient(), DummyResource(client=client))
+    users = [{"tenant_id": {"S": "tenant123"}, "user_id": {"S": f"u{i}"}} for i in range(30)]
+
+    repo.add_users(users)
+
+    assert sorted(client.calls) == [1, 5, 25]
+    assert sorted(r["PutRequest"]["Item"]["user_id"]["S"] for r in client.written) == sorted(f"u{i}" for i in range(30))
@@ -0,0 +1,58 @@
+from personalize_commons.services.interaction_tracking_service import InteractionTrackingService
+
+
+class DummyUserTracker:
+    def __init__(self, first_time=True):
+        self.first_time = first_time
+
+    def mark_user_seen_once(self, entity):
+        return self.first_time
+
+
+class DummyTrackingRepo:
+    def __init__(self, ok=True):
+        self.ok = ok
+        self.updates = []
+        self.unique_users = []
+
+    def update_interactions(self, tenant_id, event_increments, month=None, unique_users_increment=0):
+        self.updates.append((tenant_id, event_increments, month, unique_users_increment))
+        return {"ok": True} if self.ok else {"ok": False, "error": "boom"}
+
+    def increment_unique_users(self, tenant_id, month=None, by=1):
+        self.unique_users.append((tenant_id, month, by))
+        return {"ok": True}
+
+
+def test_new_user_counted_in_interactions_write():
+    repo = DummyTrackingRepo()
+    InteractionTrackingService(repo, DummyUserTracker()).track_interaction("tenant123", "user1", {"view": 1}, "2025-08")
+
+    assert repo.updates == [("tenant123", {"view": 1}, "2025-08", 1)]
+    assert repo.unique_users == []
+
+
+def test_new_user_counted_separately_when_write_fails():
+    repo = DummyTrackingRepo(ok=False)
+    InteractionTrackingService(repo, DummyUserTracker()).track_interaction("tenant123", "user1", {"view": 1}, "2025-08")
+
+    assert repo.unique_users == [("tenant123", "2025-08", 1)]
+
+
+def test_repeat_user_not_counted_when_write_fails():
+    repo = DummyTrackingRepo(ok=False)
+    InteractionTrackingService(repo, DummyUserTracker(first_time=False)).track_interaction(
+        "tenant123", "user1", {"view": 1}, "2025-08"
+    )
+
+    assert repo.unique_users == []
+
+
+def test_batch_new_users_counted_separately_when_write_fails():
+    repo = DummyTrackingRepo(ok=False)
+    InteractionTrackingService(repo, DummyUserTracker()).track_interactions(
+        "tenant123", [("user1", {"view": 1}), ("user2", {"view": 2})], "2025-08"
+    )
+
+    assert repo.updates == [("tenant123", {"view": 3}, "2025-08", 2)]
+    assert repo.unique_users == [("tenant123", "2025-08", 2)]
@@ -0,0 +1,87 @@
+import io
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from personalize_commons.dependencies.aws_providers import get_env
+from personalize_commons.services.s3_service import S3Service
+
+
+class DummyS3Client:
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        self.objects[Key] = Body
+
+    def get_object(self, Bucket, Key):
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def create_multipart_upload(self, Bucket, Key, ContentType):
+        self.parts = {}
+        self.aborted = False
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.parts[PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        self.objects[Key] = b"".join(self.parts[n] for n in numbers)
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.aborted = True
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setenv("AWS_S3_BUCKET_NAME", "bucket")
+    get_env.cache_clear()
+    yield S3Service(DummyS3Client())
+    get_env.cache_clear()
+
+
+def test_upload_jsonl_round_trip(service):
+    data = [
+        {"user_id": "u1", "score": Decimal("1.5"), "at": datetime(2025, 7, 23, 12, 0, 0), "tags": {"a"}},
+        {"user_id": "u2", 1: "non-str key"},
+    ]
+
+    key = service.upload_jsonl(data, "tenant123", "rec1", "campaign_1")
+
+    assert service.download_dict(key) == [
+        {"user_id": "u1", "score": 1.5, "at": "2025-07-23T12:00:00", "tags": ["a"]},
+        {"user_id": "u2", "1": "non-str key"},
+    ]
+
+
+def test_upload_jsonl_streams_large_payloads_as_multipart(service):
+    service.MULTIPART_PART_SIZE = 64
+    data = [{"user_id": f"u{i}", "items": ["a", "b"]} for i in range(20)]
+
+    key = service.upload_jsonl(iter(data), "tenant123", "rec1", "campaign_1")
+
+    assert len(service.s3_client.parts) > 1
+    assert service.download_dict(key) == data
+
+
+def test_upload_jsonl_aborts_multipart_on_failure(service):
+    service.MULTIPART_PART_SIZE = 64
+
+    def data():
+        for i in range(10):
+            yield {"user_id": f"u{i}", "items": ["a", "b"]}
+        raise RuntimeError("source failed")
+
+    with pytest.raises(RuntimeError):
+        service.upload_jsonl(data(), "tenant123", "rec1", "campaign_1")
+    assert service.s3_client.aborted
+
+
+def test_s3_key_layout(service):
+    key = service._get_s3_key("tenant123", "rec1", "campaign_1")
+    prefix, timestamp = key.rsplit("_", 2)[0], "_".join(key.rsplit("_", 2)[1:])
+    assert prefix == "recommendations/tenant123/campaign_1/rec1"
+    assert datetime.strptime(timestamp, "%Y%m%d_%H%M%S.jsonl")
@@ -0,0 +1,13 @@
+from personalize_commons.utils import datetime_utils
+from personalize_commons.utils.datetime_utils import ist_month, ist_now
+
+
+def test_ist_month_matches_strftime():
+    assert ist_month() == ist_now().strftime("%Y-%m")
+
+
+def test_ist_month_is_cached_within_the_minute(monkeypatch):
+    ist_month()
+    minute, _ = datetime_utils._month_cache
+    monkeypatch.setattr(datetime_utils, "_month_cache", (minute, "cached"))
+    assert ist_month() == "cached"
@@ -0,0 +1,32 @@
+from personalize_commons.utils.dynamodb_batch import batch_get_items
+
+
+class DummyResource:
+    def __init__(self, items):
+        self.items = items
+        self.calls = []
+
+    def batch_get_item(self, RequestItems):
+        (table_name, request), = RequestItems.items()
+        keys = request["Keys"]
+        self.calls.append(keys)
+        if len({tuple(sorted(key.items())) for key in keys}) != len(keys):
+            raise ValueError("Provided list of item keys contains duplicates")
+        return {"Responses": {table_name: [self.items[key["id"]] for key in keys if key["id"] in self.items]}}
+
+
+def test_batch_get_items_fetches_repeated_keys_once():
+    resource = DummyResource({"a": {"id": "a"}, "b": {"id": "b"}})
+
+    items = list(batch_get_items(resource, "table", [{"id": "a"}, {"id": "b"}, {"id": "a"}, {"id": "missing"}]))
+
+    assert sorted(item["id"] for item in items) == ["a", "b"]
+    assert resource.calls == [[{"id": "a"}, {"id": "b"}, {"id": "missing"}]]
+
+
+def test_batch_get_items_chunks_by_100():
+    resource = DummyResource({})
+
+    list(batch_get_items(resource, "table", [{"id": str(i)} for i in range(150)]))
+
+    assert [len(keys) for keys in resource.calls] == [100, 50]
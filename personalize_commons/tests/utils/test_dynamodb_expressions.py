@@ -0,0 +1,70 @@
+from datetime import datetime
+
+import pytest
+from botocore.exceptions import ClientError
+
+from personalize_commons.entity.campaign_entity import CampaignEntity, CampaignStatus
+from personalize_commons.entity.recommendation_entity import RecommendationEntity, RecommendationStatus
+from personalize_commons.utils.dynamodb_expressions import build_projection, build_set_expression, \
+    conditional_update, validate_fields
+
+
+def test_build_set_expression():
+    assert build_set_expression(("name", "updated_at")) == (
+        "SET #name = :name, #updated_at = :updated_at",
+        {"#name": "name", "#updated_at": "updated_at"},
+        (":name", ":updated_at"),
+    )
+
+
+def test_build_projection_aliases_every_name():
+    assert build_projection(["name", "status"]) == ("#p0, #p1", {"#p0": "name", "#p1": "status"})
+
+
+def test_validate_fields_returns_only_given_fields_in_item_form():
+    update = validate_fields(RecommendationEntity, {
+        "status": RecommendationStatus.COMPLETED,
+        "completed_at": datetime(2025, 7, 23, 13, 0, 0),
+    })
+    assert update == {"status": "COMPLETED", "completed_at": "2025-07-23T13:00:00"}
+    assert validate_fields(CampaignEntity, {"status": "ACTIVE"}) == {"status": "ACTIVE"}
+
+
+def test_validate_fields_rejects_invalid_values():
+    with pytest.raises(ValueError):
+        validate_fields(RecommendationEntity, {"status": "UNKNOWN"})
+
+
+class UpdateTable:
+    def __init__(self, exists=True):
+        self.exists = exists
+        self.calls = []
+
+    def update_item(self, **kwargs):
+        self.calls.append(kwargs)
+        if not self.exists:
+            raise ClientError({"Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"}},
+                              "UpdateItem")
+        values = kwargs["ExpressionAttributeValues"]
+        return {"Attributes": {"campaign_id": "c1", "campaign_name": values[":campaign_name"], "industry_type": "retail",
+                               "target_segment": None, "message_template": {}, "tenant_id": "t1"}}
+
+
+def test_conditional_update_sets_fields_and_updated_at():
+    table = UpdateTable()
+    campaign = conditional_update(table, {"tenant_id": "t1", "campaign_id": "c1"},
+                                  {"status": CampaignStatus.ACTIVE, "campaign_name": "Sale"}, CampaignEntity,
+                                  {"tenant_status": "t1#ACTIVE"})
+
+    call = table.calls[0]
+    assert call["UpdateExpression"] == ("SET #campaign_name = :campaign_name, #status = :status, "
+                                        "#tenant_status = :tenant_status, #updated_at = :updated_at")
+    assert call["ConditionExpression"] == "attribute_exists(tenant_id) AND attribute_exists(campaign_id)"
+    assert call["ExpressionAttributeValues"][":status"] == "ACTIVE"
+    assert call["ReturnValues"] == "ALL_NEW"
+    assert campaign.campaign_name == "Sale"
+
+
+def test_conditional_update_missing_item_returns_none():
+    assert conditional_update(UpdateTable(exists=False), {"tenant_id": "t1", "campaign_id": "c1"},
+                              {"campaign_name": "Sale"}, CampaignEntity) is None
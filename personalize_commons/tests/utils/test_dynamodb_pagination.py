@@ -0,0 +1,26 @@
+from personalize_commons.utils.dynamodb_pagination import paginate
+
+
+def test_paginate_follows_last_evaluated_key():
+    pages = [{"Items": [1], "LastEvaluatedKey": {"k": 1}}, {"Items": [2], "LastEvaluatedKey": {"k": 2}}, {"Items": [3]}]
+    calls = []
+
+    def query(**params):
+        calls.append(dict(params))
+        return pages[len(calls) - 1]
+
+    assert [page["Items"] for page in paginate(query, Limit=1)] == [[1], [2], [3]]
+    assert calls == [{"Limit": 1}, {"Limit": 1, "ExclusiveStartKey": {"k": 1}},
+                     {"Limit": 1, "ExclusiveStartKey": {"k": 2}}]
+
+
+def test_paginate_is_lazy():
+    calls = []
+
+    def scan(**params):
+        calls.append(params)
+        return {"Items": [], "LastEvaluatedKey": {"k": len(calls)}}
+
+    pages = paginate(scan)
+    next(pages)
+    assert len(calls) == 1
@@ -0,0 +1,61 @@
+import json
+
+from personalize_commons.constants.event_type import EventType
+from personalize_commons.constants.rabbit_mq_constants import RabbitMQConstants
+from personalize_commons.utils.rabbit_mq_message_batcher import RabbitMqMessageBatcher
+from personalize_commons.utils.rabbit_mq_message_builder import RabbitMqMessageBuilder
+
+
+def envelope(i):
+    return RabbitMqMessageBuilder.build_recommendation_envelope(EventType.RECOMMENDATION_TRIGGERED, {"i": i}, "test")
+
+
+def test_flush_on_max_size():
+    published = []
+    batcher = RabbitMqMessageBatcher(published.append, max_size=2, max_delay_ms=60_000)
+    for i in range(3):
+        batcher.add(envelope(i))
+
+    assert len(published) == 1
+    message = json.loads(published[0])
+    assert message[RabbitMQConstants.Payload.BATCH_SIZE] == 2
+    assert [e[RabbitMQConstants.Payload.PAYLOAD]["i"] for e in message[RabbitMQConstants.Payload.BATCH]] == [0, 1]
+
+    batcher.flush()
+    assert len(published) == 2
+    assert len(RabbitMqMessageBuilder.unpack_message(published[1])) == 1
+
+
+def test_flush_on_max_delay():
+    published = []
+    batcher = RabbitMqMessageBatcher(published.append, max_size=100, max_delay_ms=0)
+    batcher.add(envelope(0))
+    assert len(published) == 1
+
+
+def test_flush_empty_is_noop():
+    published = []
+    RabbitMqMessageBatcher(published.append).flush()
+    assert published == []
+
+
+def test_unpack_single_message():
+    body = RabbitMqMessageBuilder.build_recommendation_message(EventType.RECOMMENDATION_FAILED, {"i": 1}, "test")
+    envelopes = RabbitMqMessageBuilder.unpack_message(body)
+    assert len(envelopes) == 1
+    assert envelopes[0][RabbitMQConstants.Payload.PAYLOAD] == {"i": 1}
+
+
+def test_retry_message_increments_retry_count():
+    exchange, routing_key, body = RabbitMqMessageBuilder.build_retry_message(envelope(0))
+    assert exchange == RabbitMQConstants.RETRY_EXCHANGE
+    assert routing_key == RabbitMQConstants.RECOMMENDATION_RETRY_ROUTING_KEY
+    assert json.loads(body)[RabbitMQConstants.Payload.RETRY_COUNT] == 1
+
+
+def test_retry_message_routes_to_dlq_after_max_retries():
+    exhausted = {**envelope(0), RabbitMQConstants.Payload.RETRY_COUNT: RabbitMQConstants.MAX_RETRIES}
+    exchange, routing_key, body = RabbitMqMessageBuilder.build_retry_message(exhausted)
+    assert exchange == RabbitMQConstants.DLQ_EXCHANGE
+    assert routing_key == RabbitMQConstants.RECOMMENDATION_DLQ_ROUTING_KEY
+    assert json.loads(body)[RabbitMQConstants.Payload.RETRY_COUNT] == RabbitMQConstants.MAX_RETRIES
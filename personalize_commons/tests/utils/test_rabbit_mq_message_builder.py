@@ -0,0 +1,54 @@
+import json
+
+from personalize_commons.constants.event_type import EventType
+from personalize_commons.constants.rabbit_mq_constants import RabbitMQConstants
+from personalize_commons.utils.rabbit_mq_message_builder import RabbitMqMessageBuilder
+
+
+def envelope(payload, retry_count=0):
+    return RabbitMqMessageBuilder.build_recommendation_envelope(EventType.RECOMMENDATION_TRIGGERED, payload, "test",
+                                                                retry_count)
+
+
+def test_recommendation_message_stringifies_non_str_keys():
+    body = RabbitMqMessageBuilder.build_recommendation_message(EventType.RECOMMENDATION_TRIGGERED, {1: "a"}, "test")
+
+    message = json.loads(body)
+    assert message[RabbitMQConstants.Payload.PAYLOAD] == {"1": "a"}
+    assert message[RabbitMQConstants.Payload.SOURCE] == "test"
+    assert message[RabbitMQConstants.Payload.RETRY_COUNT] == 0
+
+
+def test_retry_message_increments_retry_count():
+    exchange, routing_key, body = RabbitMqMessageBuilder.build_retry_message(envelope({1: "a"}, retry_count=2))
+
+    assert exchange == RabbitMQConstants.RETRY_EXCHANGE
+    assert routing_key == RabbitMQConstants.RECOMMENDATION_RETRY_ROUTING_KEY
+    message = json.loads(body)
+    assert message[RabbitMQConstants.Payload.RETRY_COUNT] == 3
+    assert message[RabbitMQConstants.Payload.PAYLOAD] == {"1": "a"}
+
+
+def test_retry_message_goes_to_dlq_after_max_retries():
+    failed = envelope({"i": 1}, retry_count=RabbitMQConstants.MAX_RETRIES)
+    exchange, routing_key, body = RabbitMqMessageBuilder.build_retry_message(failed)
+
+    assert exchange == RabbitMQConstants.DLQ_EXCHANGE
+    assert routing_key == RabbitMQConstants.RECOMMENDATION_DLQ_ROUTING_KEY
+    assert json.loads(body)[RabbitMQConstants.Payload.RETRY_COUNT] == RabbitMQConstants.MAX_RETRIES
+
+
+def test_batch_message_round_trips_through_unpack():
+    body = RabbitMqMessageBuilder.build_batch_message([envelope({1: "a"}), envelope({"i": 2})])
+
+    assert json.loads(body)[RabbitMQConstants.Payload.BATCH_SIZE] == 2
+    envelopes = RabbitMqMessageBuilder.unpack_message(body)
+    assert [e[RabbitMQConstants.Payload.PAYLOAD] for e in envelopes] == [{"1": "a"}, {"i": 2}]
+
+
+def test_unpack_single_message():
+    body = RabbitMqMessageBuilder.build_recommendation_message(EventType.RECOMMENDATION_TRIGGERED, {"i": 1}, "test")
+
+    envelopes = RabbitMqMessageBuilder.unpack_message(body.encode())
+    assert len(envelopes) == 1
+    assert envelopes[0][RabbitMQConstants.Payload.PAYLOAD] == {"i": 1}
@@ -0,0 +1,30 @@
+import time
+
+from personalize_commons.utils.ttl_cache import MISSING, TTLCache
+
+
+def test_ttl_cache_hit_miss_and_none_values():
+    cache = TTLCache(maxsize=10, ttl=60)
+    assert cache.get("a") is MISSING
+    cache.set("a", None)
+    assert cache.get("a") is None
+    cache.pop("a")
+    assert cache.get("a") is MISSING
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert len(cache) == 2
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is MISSING
@@ -1,3 +1,4 @@
+import time
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
@@ -17,6 +18,24 @@ def ist_now_iso() -> str:
     """
     return ist_now().isoformat()
 
+# (epoch minute, "YYYY-MM") of the last ist_month() call
+_month_cache: tuple[int, str] = (-1, "")
+
+def ist_month() -> str:
+    """
+    Get current IST month as "YYYY-MM" (sort key format of the interaction tables).
+    IST is a whole-minute offset from UTC, so the month can only change on a minute boundary;
+    the string is computed at most once per minute and otherwise served from _month_cache.
+    Example: "2025-07"
+    """
+    global _month_cache
+    minute = int(time.time()) // 60
+    cached_minute, month = _month_cache
+    if minute != cached_minute:
+        month = ist_now().isoformat()[:7]
+        _month_cache = (minute, month)
+    return month
+
 def ist_now_human_readable() -> str:
     """
     Return IST time in human-friendly format (e.g., for logging or UI).
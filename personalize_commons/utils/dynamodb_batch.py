@@ -0,0 +1,69 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List
+
+from personalize_commons.constants.context import run_in_executor_with_ctx
+
+# BatchGetItem accepts at most 100 keys per call
+BATCH_GET_SIZE = 100
+# attempts per chunk while DynamoDB keeps returning UnprocessedKeys
+BATCH_GET_MAX_ATTEMPTS = 8
+# BatchWriteItem accepts at most 25 put requests per call
+BATCH_WRITE_SIZE = 25
+BATCH_WRITE_MAX_WORKERS = 8
+# attempts per chunk while DynamoDB keeps returning UnprocessedItems
+BATCH_WRITE_MAX_ATTEMPTS = 8
+
+
+def batch_get_items(resource, table_name: str, keys: Iterable[Dict]) -> Iterator[Dict]:
+    """
+    Fetch items by primary key with BatchGetItem, 100 keys per call.
+    UnprocessedKeys are re-requested with jittered exponential backoff.
+    Items are yielded in the order DynamoDB returns them (not key order); missing keys are skipped.
+    Repeated keys are fetched once, as BatchGetItem rejects a request containing duplicates.
+    """
+    keys = list({tuple(sorted(key.items())): key for key in keys}.values())
+    for i in range(0, len(keys), BATCH_GET_SIZE):
+        yield from _batch_get_chunk(resource, table_name, keys[i:i + BATCH_GET_SIZE])
+
+
+def _batch_get_chunk(resource, table_name: str, chunk: List[Dict]) -> Iterator[Dict]:
+    request_items = {table_name: {'Keys': chunk}}
+    for attempt in range(BATCH_GET_MAX_ATTEMPTS):
+        response = resource.batch_get_item(RequestItems=request_items)
+        yield from response.get('Responses', {}).get(table_name, [])
+        request_items = response.get('UnprocessedKeys')
+        if not request_items:
+            return
+        time.sleep(random.uniform(0, min(2.0, 0.05 * 2 ** attempt)))
+    unprocessed = len(request_items.get(table_name, {}).get('Keys', []))
+    raise Exception(f"{unprocessed} keys were not read after {BATCH_GET_MAX_ATTEMPTS} attempts")
+
+
+def batch_put_items(client, table_name: str, items: List[Dict]) -> None:
+    """
+    Put low-level (AttributeValue) items with BatchWriteItem, 25 items per call, chunks written concurrently.
+    UnprocessedItems are retried with jittered exponential backoff; the first failed chunk is re-raised.
+    `client` must parse responses normally (not aws_providers.get_dynamodb_raw_client), since
+    UnprocessedItems are resubmitted as returned.
+    """
+    chunks = [items[i:i + BATCH_WRITE_SIZE] for i in range(0, len(items), BATCH_WRITE_SIZE)]
+    if not chunks:
+        return
+    with ThreadPoolExecutor(max_workers=min(BATCH_WRITE_MAX_WORKERS, len(chunks))) as pool:
+        futures = [run_in_executor_with_ctx(pool, _batch_put_chunk, client, table_name, chunk) for chunk in chunks]
+        for future in futures:
+            future.result()
+
+
+def _batch_put_chunk(client, table_name: str, chunk: List[Dict]) -> None:
+    request_items = {table_name: [{'PutRequest': {'Item': item}} for item in chunk]}
+    for attempt in range(BATCH_WRITE_MAX_ATTEMPTS):
+        response = client.batch_write_item(RequestItems=request_items)
+        request_items = response.get('UnprocessedItems')
+        if not request_items:
+            return
+        time.sleep(random.uniform(0, min(2.0, 0.05 * 2 ** attempt)))
+    unprocessed = len(request_items.get(table_name, []))
+    raise Exception(f"{unprocessed} items were not written after {BATCH_WRITE_MAX_ATTEMPTS} attempts")
@@ -0,0 +1,83 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple, Type, TypeVar
+
+from botocore.exceptions import ClientError
+from pydantic import BaseModel
+
+from personalize_commons.constants.db_constants import DBConstants
+from personalize_commons.utils.datetime_utils import ist_now_iso
+
+EntityT = TypeVar('EntityT', bound=BaseModel)
+
+
+@lru_cache(maxsize=256)
+def build_set_expression(fields: Tuple[str, ...]) -> Tuple[str, Dict[str, str], Tuple[str, ...]]:
+    """
+    Build the 'SET #a = :a, ...' UpdateExpression, its ExpressionAttributeNames and the value aliases
+    (in field order) for a tuple of attribute names.
+    Templates are cached per field tuple, so callers only build the ExpressionAttributeValues per call.
+    """
+    update_expression = 'SET ' + ', '.join(f'#{k} = :{k}' for k in fields)
+    expression_attribute_names = {f'#{k}': k for k in fields}
+    return update_expression, expression_attribute_names, tuple(f':{k}' for k in fields)
+
+
+def build_projection(fields: Iterable[str]) -> Tuple[str, Dict[str, str]]:
+    """
+    Build a ProjectionExpression and its ExpressionAttributeNames for the given attribute names.
+    Every name gets a '#pN' alias, so reserved words (e.g. status, name) can be projected.
+    """
+    names = {f'#p{i}': name for i, name in enumerate(fields)}
+    return ', '.join(names), names
+
+
+@lru_cache(maxsize=64)
+def _exists_condition(key_names: Tuple[str, ...]) -> str:
+    return ' AND '.join(f'attribute_exists({k})' for k in key_names)
+
+
+def validate_fields(entity_cls: Type[BaseModel], fields: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate only the given fields of entity_cls (a partial update) and return them in dumped item form.
+    Each value runs through its field validator on an unvalidated instance instead of rebuilding the whole entity.
+    Raises pydantic.ValidationError (a ValueError) for invalid values.
+    """
+    shell = entity_cls.model_construct()
+    for field, value in fields.items():
+        entity_cls.__pydantic_validator__.validate_assignment(shell, field, value)
+    return shell.model_dump(include=set(fields))
+
+
+def conditional_update(table, key: Dict[str, Any], fields: Dict[str, Any], entity_cls: Type[EntityT],
+                       extra_fields: Optional[Dict[str, Any]] = None) -> Optional[EntityT]:
+    """
+    Validate `fields` (see validate_fields) and SET them, plus updated_at = now, on the existing item at `key`.
+    One UpdateItem does it all: the condition requires the item to exist and ALL_NEW returns the new image,
+    so there is no read-before-write round trip.
+    extra_fields are written as given, without validation (e.g. derived index keys).
+    Returns the updated entity, or None when no item exists at `key`; other ClientErrors are raised.
+    """
+    values = validate_fields(entity_cls, fields)
+    if extra_fields:
+        values.update(extra_fields)
+
+    names = tuple(sorted(values))
+    update_expression, expression_attribute_names, value_aliases = build_set_expression(
+        names + (DBConstants.UPDATED_AT,)
+    )
+    expression_attribute_values = dict(zip(value_aliases, [values[k] for k in names] + [ist_now_iso()]))
+
+    try:
+        response = table.update_item(
+            Key=key,
+            UpdateExpression=update_expression,
+            ConditionExpression=_exists_condition(tuple(key)),
+            ExpressionAttributeNames=expression_attribute_names,
+            ExpressionAttributeValues=expression_attribute_values,
+            ReturnValues='ALL_NEW'
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return None
+        raise
+    return entity_cls.from_dynamodb_item(response['Attributes'])
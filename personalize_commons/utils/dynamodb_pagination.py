@@ -0,0 +1,15 @@
+from typing import Any, Callable, Dict, Iterator
+
+
+def paginate(call: Callable[..., Dict[str, Any]], **params) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every response page of a Query/Scan call (e.g. table.query), following LastEvaluatedKey
+    until DynamoDB reports no more pages. Only one page is held in memory at a time.
+    """
+    while True:
+        response = call(**params)
+        yield response
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            return
+        params['ExclusiveStartKey'] = last_key
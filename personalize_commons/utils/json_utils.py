@@ -0,0 +1,16 @@
+from typing import Any, Callable, Optional
+
+import orjson
+
+# non-str dict keys are stringified like json.dumps instead of raising
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize obj to JSON bytes with orjson; `default` converts types orjson does not handle natively."""
+    return orjson.dumps(obj, default=default, option=ORJSON_OPTIONS)
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse JSON from str or bytes (bytes are parsed directly, without a decode pass)."""
+    return orjson.loads(data)
@@ -0,0 +1,54 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from personalize_commons.constants.rabbit_mq_constants import RabbitMQConstants
+from personalize_commons.utils.rabbit_mq_message_builder import RabbitMqMessageBuilder
+
+
+class RabbitMqMessageBatcher:
+    """
+    Accumulates message envelopes and publishes them as one batch message.
+
+    A batch is flushed when it reaches max_size envelopes, or on the first add after
+    max_delay_ms has passed since the batch was started. Call flush() on shutdown
+    to publish whatever is left.
+
+    usage
+        batcher = RabbitMqMessageBatcher(publish=lambda body: channel.basic_publish(
+            exchange=RabbitMQConstants.RECOMMENDATION_EXCHANGE,
+            routing_key=RabbitMQConstants.RECOMMENDATION_START_ROUTING_KEY,
+            body=body))
+        batcher.add(RabbitMqMessageBuilder.build_recommendation_envelope(event_type, payload, source))
+        ...
+        batcher.flush()
+    """
+
+    def __init__(self,
+                 publish: Callable[[str], Any],
+                 max_size: int = RabbitMQConstants.BATCH_MAX_SIZE,
+                 max_delay_ms: int = RabbitMQConstants.BATCH_MAX_DELAY_MS):
+        self.publish = publish
+        self.max_size = max_size
+        self.max_delay = max_delay_ms / 1000
+        self._envelopes: List[Dict[str, Any]] = []
+        self._started_at = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, envelope: Dict[str, Any]) -> None:
+        with self._lock:
+            if not self._envelopes:
+                self._started_at = time.monotonic()
+            self._envelopes.append(envelope)
+            if len(self._envelopes) >= self.max_size or time.monotonic() - self._started_at >= self.max_delay:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._envelopes:
+            return
+        envelopes, self._envelopes = self._envelopes, []
+        self.publish(RabbitMqMessageBuilder.build_batch_message(envelopes))
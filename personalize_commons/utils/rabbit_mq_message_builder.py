@@ -1,24 +1,70 @@
-import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 from personalize_commons.constants.event_type import EventType
 from personalize_commons.constants.rabbit_mq_constants import RabbitMQConstants
+from personalize_commons.utils import json_utils
 from personalize_commons.utils.datetime_utils import ist_now_iso
 
 
 class RabbitMqMessageBuilder:
 
+    @staticmethod
+    def build_recommendation_envelope(event_type: EventType,
+                                      payload: Dict[str, Any],
+                                      source: str,
+                                      retry_count: int = 0
+                                      ) -> Dict[str, Any]:
+        return {
+            RabbitMQConstants.Payload.EVENT_TYPE: str(event_type),
+            RabbitMQConstants.Payload.SOURCE:source,
+            RabbitMQConstants.Payload.TIMESTAMP: ist_now_iso(),
+            RabbitMQConstants.Payload.PAYLOAD: payload,
+            RabbitMQConstants.Payload.RETRY_COUNT: retry_count
+        }
+
     @staticmethod
     def build_recommendation_message(event_type: EventType,
                                      payload: Dict[str, Any],
                                      source: str,
                                      retry_count: int = 0
                                      ) -> str:
+        message = RabbitMqMessageBuilder.build_recommendation_envelope(event_type, payload, source, retry_count)
+        return json_utils.dumps(message).decode()
+
+    @staticmethod
+    def build_retry_message(envelope: Dict[str, Any]) -> Tuple[str, str, str]:
+        """
+        Decide where a failed envelope goes next.
+        Returns (exchange, routing_key, body): the retry exchange with retry_count + 1 while
+        under MAX_RETRIES, otherwise the DLQ exchange with the envelope unchanged.
+        """
+        retry_count = envelope.get(RabbitMQConstants.Payload.RETRY_COUNT, 0)
+        if retry_count >= RabbitMQConstants.MAX_RETRIES:
+            return (RabbitMQConstants.DLQ_EXCHANGE,
+                    RabbitMQConstants.RECOMMENDATION_DLQ_ROUTING_KEY,
+                    json_utils.dumps(envelope).decode())
+
+        message = {**envelope, RabbitMQConstants.Payload.RETRY_COUNT: retry_count + 1}
+        return (RabbitMQConstants.RETRY_EXCHANGE,
+                RabbitMQConstants.RECOMMENDATION_RETRY_ROUTING_KEY,
+                json_utils.dumps(message).decode())
+
+    @staticmethod
+    def build_batch_message(envelopes: List[Dict[str, Any]]) -> str:
+        """Wrap several envelopes into one message body, published and acked as a single frame."""
         message = {
-            RabbitMQConstants.Payload.EVENT_TYPE: str(event_type),
-            RabbitMQConstants.Payload.SOURCE:source,
-            RabbitMQConstants.Payload.TIMESTAMP: ist_now_iso(),
-            RabbitMQConstants.Payload.PAYLOAD: payload,
-            RabbitMQConstants.Payload.RETRY_COUNT: retry_count
+            RabbitMQConstants.Payload.BATCH: envelopes,
+            RabbitMQConstants.Payload.BATCH_SIZE: len(envelopes),
         }
-        return json.dumps(message)
+        return json_utils.dumps(message).decode()
+
+    @staticmethod
+    def unpack_message(body: str | bytes) -> List[Dict[str, Any]]:
+        """
+        Parse a message body into its envelopes.
+        Works for both single-envelope and batch messages, so consumers can handle either.
+        """
+        message = json_utils.loads(body)
+        if RabbitMQConstants.Payload.BATCH in message:
+            return message[RabbitMQConstants.Payload.BATCH]
+        return [message]